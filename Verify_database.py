@@ -17,46 +17,55 @@ def verify_database():
         print(f"   Cherchée dans: {os.path.abspath(DB_PATH)}")
         return
     
-    print("✅ Base de données trouvée!")
-    print(f"   Emplacement: {os.path.abspath(DB_PATH)}")
-    print()
+    # Sortie accumulée puis écrite en une fois à la fin
+    buf = []
+    out = buf.append
+    
+    out("✅ Base de données trouvée!")
+    out(f"   Emplacement: {os.path.abspath(DB_PATH)}")
+    out("")
     
     # Connexion
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
     # 1. Vérifie les tables
-    print("=" * 50)
-    print("📋 TABLES DANS LA BASE")
-    print("=" * 50)
+    out("=" * 50)
+    out("📋 TABLES DANS LA BASE")
+    out("=" * 50)
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
     tables = cursor.fetchall()
     for table in tables:
-        print(f"  - {table[0]}")
-    print()
-    
-    # 2. Compte les scans
-    print("=" * 50)
-    print("📊 STATISTIQUES SCANS")
-    print("=" * 50)
+        out(f"  - {table[0]}")
+    out("")
     
-    cursor.execute("SELECT COUNT(*) FROM scans")
-    total_rows = cursor.fetchone()[0]
-    print(f"  Nombre de lignes dans 'scans': {total_rows}")
+    # Tous les compteurs en une seule requête (un seul aller-retour disque)
+    cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM scans),
+            (SELECT COALESCE(SUM(quantity), 0) FROM scans),
+            (SELECT COUNT(DISTINCT upc) FROM scans),
+            (SELECT COUNT(*) FROM manifest),
+            (SELECT COALESCE(SUM(quantity), 0) FROM manifest),
+            (SELECT COUNT(*) FROM dimensions)
+    """)
+    (total_rows, total_qty, unique_upcs,
+     manifest_count, manifest_qty, dims_count) = cursor.fetchone()
     
-    cursor.execute("SELECT SUM(quantity) FROM scans")
-    total_qty = cursor.fetchone()[0] or 0
-    print(f"  Total de livres scannés: {total_qty}")
+    # 2. Compte les scans
+    out("=" * 50)
+    out("📊 STATISTIQUES SCANS")
+    out("=" * 50)
     
-    cursor.execute("SELECT COUNT(DISTINCT upc) FROM scans")
-    unique_upcs = cursor.fetchone()[0]
-    print(f"  UPCs uniques: {unique_upcs}")
-    print()
+    out(f"  Nombre de lignes dans 'scans': {total_rows}")
+    out(f"  Total de livres scannés: {total_qty}")
+    out(f"  UPCs uniques: {unique_upcs}")
+    out("")
     
     # 3. Affiche les 10 derniers scans
-    print("=" * 50)
-    print("📚 DERNIERS SCANS (10 max)")
-    print("=" * 50)
+    out("=" * 50)
+    out("📚 DERNIERS SCANS (10 max)")
+    out("=" * 50)
     
     cursor.execute("""
         SELECT timestamp, bin, upc, condition, quantity, title
@@ -65,48 +74,46 @@ def verify_database():
         LIMIT 10
     """)
     
-    scans = cursor.fetchall()
+    # Itère directement sur le curseur (pas de fetchall)
+    found = False
+    for scan in cursor:
+        found = True
+        timestamp, bin_code, upc, condition, qty, title = scan
+        title_short = title[:40] + "..." if title and len(title) > 40 else (title or "Sans titre")
+        out(f"  [{timestamp[:19]}] {bin_code} | {upc} | {condition} | Qty: {qty}")
+        out(f"    → {title_short}")
+        out("")
     
-    if not scans:
-        print("  ⚠️ Aucun scan trouvé dans la base!")
-    else:
-        for scan in scans:
-            timestamp, bin_code, upc, condition, qty, title = scan
-            title_short = title[:40] + "..." if title and len(title) > 40 else (title or "Sans titre")
-            print(f"  [{timestamp[:19]}] {bin_code} | {upc} | {condition} | Qty: {qty}")
-            print(f"    → {title_short}")
-            print()
+    if not found:
+        out("  ⚠️ Aucun scan trouvé dans la base!")
     
     # 4. Vérifie MANIFEST
-    print("=" * 50)
-    print("📦 STATISTIQUES MANIFEST")
-    print("=" * 50)
+    out("=" * 50)
+    out("📦 STATISTIQUES MANIFEST")
+    out("=" * 50)
     
-    cursor.execute("SELECT COUNT(*) FROM manifest")
-    manifest_count = cursor.fetchone()[0]
-    print(f"  Livres dans MANIFEST: {manifest_count}")
+    out(f"  Livres dans MANIFEST: {manifest_count}")
     
     if manifest_count > 0:
-        cursor.execute("SELECT SUM(quantity) FROM manifest")
-        manifest_qty = cursor.fetchone()[0] or 0
-        print(f"  Quantité totale MANIFEST: {manifest_qty}")
-    print()
+        out(f"  Quantité totale MANIFEST: {manifest_qty}")
+    out("")
     
     # 5. Vérifie dimensions cache
-    print("=" * 50)
-    print("📏 CACHE DIMENSIONS")
-    print("=" * 50)
+    out("=" * 50)
+    out("📏 CACHE DIMENSIONS")
+    out("=" * 50)
     
-    cursor.execute("SELECT COUNT(*) FROM dimensions")
-    dims_count = cursor.fetchone()[0]
-    print(f"  UPCs avec dimensions en cache: {dims_count}")
-    print()
+    out(f"  UPCs avec dimensions en cache: {dims_count}")
+    out("")
     
     conn.close()
     
-    print("=" * 50)
-    print("✅ VÉRIFICATION TERMINÉE")
-    print("=" * 50)
+    out("=" * 50)
+    out("✅ VÉRIFICATION TERMINÉE")
+    out("=" * 50)
+    
+    # Une seule écriture sur la console (au lieu de dizaines de print)
+    print("\n".join(buf))
 
 if __name__ == "__main__":
     verify_database()
\ No newline at end of file
@@ -4,6 +4,7 @@ Toutes les constantes et paramètres de l'application
 """
 
 import os
+import re
 from pathlib import Path
 
 # ========================================================================
@@ -36,10 +37,31 @@ GOOGLE_BOOKS_RATE_LIMIT = 1.0  # secondes entre requêtes
 OPENLIBRARY_API = "https://openlibrary.org/api/books"
 OPENLIBRARY_TIMEOUT = 10
 OPENLIBRARY_RATE_LIMIT = 1.0
+OPENLIBRARY_BATCH_SIZE = 50  # UPCs par requête bibkeys= (enrichissement par lot)
+ENRICH_ALWAYS_MERGE_OL = False  # True: OpenLibrary même si Google Books a tout trouvé
+
+# Espacement des requêtes par API (*_RATE_LIMIT): désactivé par défaut, à
+# activer si une API répond 429 (les retries gèrent déjà les 429 ponctuels)
+API_THROTTLE = False
+
+# Délai max d'établissement de connexion (les *_TIMEOUT ci-dessus = lecture)
+API_CONNECT_TIMEOUT = 3.05
+
+# En-tête User-Agent envoyé aux APIs
+API_USER_AGENT = "ScannerLivre/2.0"
 
 # Retry logic
 API_MAX_RETRIES = 3
-API_RETRY_DELAY = 2  # secondes
+API_RETRY_DELAY = 2  # secondes (doublé à chaque nouvel essai)
+API_RETRY_JITTER = 0.5  # secondes d'aléa max ajoutées à chaque attente
+
+# Cache des réponses API (table api_cache)
+API_CACHE_TTL = 30 * 24 * 3600  # secondes (30 jours)
+API_CACHE_REFRESH = False       # True: ignore le cache et rappelle les APIs
+
+# Enrichissement parallèle
+API_MAX_WORKERS = 8    # livres enrichis en même temps
+API_POOL_SIZE = 32     # connexions HTTP gardées ouvertes par hôte
 
 # ========================================================================
 # EBAY CONFIGURATION
@@ -146,6 +168,16 @@ CONDITIONS = {
     }
 }
 
+# Tables de lookup précalculées (majuscules + minuscules) pour les helpers
+# appelés à chaque ligne d'export/enrichissement: un seul dict.get()
+_CONDITION_LOOKUP = {**CONDITIONS, **{k.lower(): v for k, v in CONDITIONS.items()}}
+
+# Champs à plat par condition (ex: CONDITION_ID['USED'] == CONDITION_ID['used'] == '5000')
+CONDITION_ID = {k: v['id'] for k, v in _CONDITION_LOOKUP.items()}
+CONDITION_NAME = {k: v['name'] for k, v in _CONDITION_LOOKUP.items()}
+CONDITION_FACTOR = {k: v['price_factor'] for k, v in _CONDITION_LOOKUP.items()}
+CONDITION_DESCRIPTION = {k: v['description'] for k, v in _CONDITION_LOOKUP.items()}
+
 # Prix minimum (si MSRP × factor < MIN_PRICE)
 MIN_PRICE = 3.99
 
@@ -154,7 +186,8 @@ MIN_PRICE = 3.99
 # ========================================================================
 
 # BIN: Lettre + 3-4 chiffres (ex: C001, I004, Z9999)
-BIN_REGEX = r'^[A-Z]\d{3,4}$'
+# Compilé une seule fois à l'import (évite de recompiler à chaque scan)
+BIN_REGEX = re.compile(r'^[A-Z]\d{3,4}$')
 
 # UPC: 10-14 chiffres
 UPC_MIN_LENGTH = 10
@@ -210,6 +243,9 @@ STATUS_SOLD = "Vendu"
 
 STATUS_OPTIONS = [STATUS_PENDING, STATUS_LISTED, STATUS_SOLD]
 
+# Connexions lecture seule (dashboard: requêtes en parallèle grâce au mode WAL)
+DB_READ_POOL_SIZE = 4
+
 # ========================================================================
 # ENRICHMENT
 # ========================================================================
@@ -236,7 +272,7 @@ EXPORT_MIN_PRICE_CHECK = True  # Skip si price < MIN_PRICE
 # LOGGING
 # ========================================================================
 
-LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR
+LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR (DEBUG: détail API par livre)
 LOG_TO_FILE = False  # Si True, écrit dans scanner.log
 
 # ========================================================================
@@ -271,31 +307,55 @@ def is_on_usb_drive():
 
 def get_condition_info(condition):
     """Retourne info condition."""
-    return CONDITIONS.get(condition.upper(), CONDITIONS['USED'])
+    info = _CONDITION_LOOKUP.get(condition)
+    if info is None:
+        # Casse mixte (ex: 'Used') ou condition inconnue
+        info = CONDITIONS.get(condition.upper(), CONDITIONS['USED'])
+    return info
 
 # ========================================================================
 # VALIDATION HELPERS
 # ========================================================================
 
+def is_valid_bin(bin_code):
+    """Valide un BIN déjà en majuscules (ex: C001)."""
+    return bool(BIN_REGEX.match(bin_code))
+
+def is_valid_upc(upc):
+    """Valide un UPC: 10-14 chiffres."""
+    return UPC_MIN_LENGTH <= len(upc) <= UPC_MAX_LENGTH and upc.isdigit()
+
 def validate_condition(condition):
     """Valide que la condition est valide."""
     return condition.upper() in VALID_CONDITIONS
 
 def get_price_factor(condition):
     """Retourne le facteur de prix pour une condition."""
-    return CONDITIONS.get(condition.upper(), {}).get('price_factor', 0.35)
+    factor = CONDITION_FACTOR.get(condition)
+    if factor is None:
+        factor = CONDITION_FACTOR.get(condition.upper(), 0.35)
+    return factor
+
+def get_condition_id(condition):
+    """Retourne l'ID condition eBay (défaut: USED)."""
+    condition_id = CONDITION_ID.get(condition)
+    if condition_id is None:
+        condition_id = CONDITION_ID.get(condition.upper(), CONDITION_ID['USED'])
+    return condition_id
 
 # ========================================================================
 # DEBUG INFO
 # ========================================================================
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("SCANNER LIVRE - CONFIGURATION")
-    print("=" * 60)
-    print(f"Database: {get_db_path()}")
-    print(f"Backup dir: {get_backup_dir()}")
-    print(f"On USB drive: {is_on_usb_drive()}")
-    print(f"Conditions: {list(CONDITIONS.keys())}")
-    print(f"eBay headers: {len(EBAY_CSV_HEADERS)} colonnes")
-    print("=" * 60)
\ No newline at end of file
+    print("\n".join([
+        "=" * 60,
+        "SCANNER LIVRE - CONFIGURATION",
+        "=" * 60,
+        f"Database: {get_db_path()}",
+        f"Backup dir: {get_backup_dir()}",
+        f"On USB drive: {is_on_usb_drive()}",
+        f"Conditions: {list(CONDITIONS.keys())}",
+        f"eBay headers: {len(EBAY_CSV_HEADERS)} colonnes",
+        "=" * 60,
+    ]))
\ No newline at end of file
@@ -3,30 +3,74 @@ Module Dashboard - Scanner Livre App
 Statistiques et visualisations
 """
 
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor
 import database
 import config
 
+# Requêtes dashboard indépendantes → exécutées en parallèle (1 connexion lecture chacune)
+_EXECUTOR = ThreadPoolExecutor(max_workers=config.DB_READ_POOL_SIZE,
+                               thread_name_prefix='dashboard')
+
+# Fonctions appelées à chaque rafraîchissement du dashboard: liées une fois
+# ici plutôt que résolues (database.xxx) à chaque appel
+_monotonic = time.monotonic
+_get_data_version = database.get_data_version
+_get_dashboard_scalars = database.get_dashboard_scalars
+_get_scans_by_status = database.get_scans_by_status
+_get_scans_by_condition = database.get_scans_by_condition
+
+# Dernières métriques calculées: (time.monotonic(), version données, metrics)
+_METRICS_CACHE = None
+
 # ========================================================================
 # METRICS
 # ========================================================================
 
-def get_dashboard_metrics():
+def get_dashboard_metrics(ttl=1.0):
+    """
+    Métriques du dashboard, mises en cache pendant `ttl` secondes.
+    Le cache est aussi invalidé dès qu'une écriture a eu lieu en base
+    (scan, import MANIFEST...), donc les chiffres ne sont jamais périmés.
+    Args: ttl (float): durée de vie du cache, 0 = toujours recalculer
+    Returns: dict
+    """
+    global _METRICS_CACHE
+    
+    now = _monotonic()
+    version = _get_data_version()
+    cached = _METRICS_CACHE
+    
+    if ttl and cached and now - cached[0] < ttl and cached[1] == version:
+        return cached[2]
+    
+    metrics = compute_dashboard_metrics()
+    _METRICS_CACHE = (now, version, metrics)
+    return metrics
+
+def invalidate_metrics():
+    """Vide le cache des métriques (prochain appel = requêtes SQL)."""
+    global _METRICS_CACHE
+    _METRICS_CACHE = None
+
+def compute_dashboard_metrics():
     """
-    Toutes les métriques pour le dashboard.
+    Toutes les métriques pour le dashboard (sans cache).
+    Les compteurs viennent d'une seule requête SQL; les regroupements
+    par statut/condition sont lancés en parallèle sur le pool lecture.
     Returns: dict
     """
-    # Manifest stats
-    manifest_count = database.count_manifest()
+    submit = _EXECUTOR.submit
     
-    # Scans
-    total_scanned = database.get_total_scanned()
-    scans_today = database.get_scans_today_quantity()
-    enriched_count = database.get_enriched_count()
-    exported_count = database.get_exported_count()
+    # Status breakdown (GROUP BY séparés, en parallèle)
+    f_by_status = submit(_get_scans_by_status)
+    f_by_condition = submit(_get_scans_by_condition)
     
-    # Sales
-    sales_summary = get_sales_summary_quick()
+    # Manifest, scans, sales: un seul aller-retour
+    scalars = _get_dashboard_scalars()
+    
+    manifest_count = scalars['manifest_total']
+    total_scanned = scalars['total_scanned']
     
     # Progress
     progress_percent = (total_scanned / manifest_count * 100) if manifest_count > 0 else 0
@@ -37,33 +81,30 @@ def get_dashboard_metrics():
         
         # Scans
         'total_scanned': total_scanned,
-        'scans_today': scans_today,
-        'enriched_count': enriched_count,
-        'exported_count': exported_count,
+        'scans_today': scalars['scans_today'],
+        'enriched_count': scalars['enriched_count'],
+        'exported_count': scalars['exported_count'],
         'remaining': max(0, manifest_count - total_scanned),
         
         # Progress
         'progress_percent': round(progress_percent, 1),
         
         # Sales
-        'total_sales': sales_summary['total_items'],
-        'total_revenue': sales_summary['revenue'],
+        'total_sales': scalars['total_sales'],
+        'total_revenue': scalars['total_revenue'],
         
         # Status breakdown
-        'by_status': database.get_scans_by_status(),
-        'by_condition': database.get_scans_by_condition()
+        'by_status': f_by_status.result(),
+        'by_condition': f_by_condition.result()
     }
 
 def get_sales_summary_quick():
-    """Quick sales summary."""
-    all_sales = database.get_all_sales()
-    
-    total_items = sum(s['quantity'] for s in all_sales)
-    revenue = database.get_total_revenue()
+    """Quick sales summary (une seule requête SQL)."""
+    totals = database.get_sales_totals()
     
     return {
-        'total_items': total_items,
-        'revenue': revenue
+        'total_items': totals['total_items'],
+        'revenue': totals['total_revenue']
     }
 
 # ========================================================================
@@ -78,15 +119,9 @@ def get_daily_scans_chart_data(days=7):
     """
     data = database.get_daily_scans(days)
     
-    labels = []
-    values = []
-    
-    for row in data:
-        # Format date: MM-DD
-        date_obj = datetime.fromisoformat(row['date'])
-        label = date_obj.strftime('%m-%d')
-        labels.append(label)
-        values.append(row['quantity'])
+    # Labels MM-DD déjà formatés par database.get_daily_scans
+    labels = [row['label'] for row in data]
+    values = [row['quantity'] for row in data]
     
     return {
         'labels': labels,
@@ -105,7 +140,7 @@ def get_condition_pie_chart_data():
     
     for row in data:
         labels.append(row['condition'])
-        values.append(row['total_qty'])
+        values.append(row['count'])
     
     return {
         'labels': labels,
@@ -124,7 +159,7 @@ def get_status_bar_chart_data():
     
     for row in data:
         labels.append(row['status'])
-        values.append(row['total_qty'])
+        values.append(row['count'])
     
     return {
         'labels': labels,
@@ -136,13 +171,8 @@ def get_status_bar_chart_data():
 # ========================================================================
 
 def get_top_pallets(limit=5):
-    """Top pallets par progression."""
-    pallets = database.get_progress_by_pallet()
-    
-    # Sort by scanned quantity desc
-    sorted_pallets = sorted(pallets, key=lambda x: x['scanned_quantity'], reverse=True)
-    
-    return sorted_pallets[:limit]
+    """Top pallets par progression (tri + LIMIT faits en SQL)."""
+    return database.get_top_pallets_by_scanned(limit)
 
 def get_recent_activity(limit=10):
     """Activité récente (derniers scans)."""
@@ -184,18 +214,19 @@ Exportés: {metrics['exported_count']}
 # ========================================================================
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("DASHBOARD MODULE - TEST")
-    print("=" * 60)
-    
     # Metrics
     metrics = get_dashboard_metrics()
-    print(f"\nMétriques:")
-    print(f"  Total scanné: {metrics['total_scanned']}")
-    print(f"  Aujourd'hui: {metrics['scans_today']}")
-    print(f"  Progression: {metrics['progress_percent']}%")
     
-    # Summary
-    print(f"\n{get_progress_summary_text()}")
-    
-    print("\n" + "=" * 60)
\ No newline at end of file
+    print("\n".join([
+        "=" * 60,
+        "DASHBOARD MODULE - TEST",
+        "=" * 60,
+        "\nMétriques:",
+        f"  Total scanné: {metrics['total_scanned']}",
+        f"  Aujourd'hui: {metrics['scans_today']}",
+        f"  Progression: {metrics['progress_percent']}%",
+        
+        # Summary
+        f"\n{get_progress_summary_text()}",
+        "\n" + "=" * 60,
+    ]))
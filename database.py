@@ -34,8 +34,8 @@ def get_daily_scans(days=7):
         days: Nombre de jours à récupérer (défaut: 7)
     
     Returns:
-        list: Liste avec date et quantité par jour
-              [{'date': '2025-10-20', 'quantity': 50}, ...]
+        list: Liste avec date, label (MM-DD) et quantité par jour
+              [{'date': '2025-10-20', 'label': '10-20', 'quantity': 50}, ...]
     
     Utilisée par:
         - dashboard_module.py (graphique scans quotidiens)
@@ -53,17 +53,20 @@ def get_daily_scans(days=7):
     today = datetime.now().date()
     start_date = today - timedelta(days=days-1)
     
+    # timestamp est en ISO 8601: les 10 premiers caractères = la date.
+    # substr() évite de parser chaque timestamp (DATE()), et le filtre
+    # "timestamp >= ?" reste une recherche par plage sur idx_scans_ts.
     query = """
     SELECT 
-        DATE(timestamp) as date,
+        substr(timestamp, 1, 10) as date,
         SUM(quantity) as quantity
     FROM scans
-    WHERE DATE(timestamp) >= ?
-    GROUP BY DATE(timestamp)
+    WHERE timestamp >= ?
+    GROUP BY date
     ORDER BY date ASC
     """
     
-    results = fetch_all(query, (start_date.isoformat(),))
+    results = fetch_all_rows(query, (start_date.isoformat(),))
     
     # Remplir les jours manquants avec 0
     date_map = {row['date']: row['quantity'] for row in results}
@@ -75,6 +78,7 @@ def get_daily_scans(days=7):
         
         complete_data.append({
             'date': date_str,
+            'label': date_str[5:],  # 'YYYY-MM-DD' → 'MM-DD'
             'quantity': date_map.get(date_str, 0)
         })
     
@@ -106,8 +110,10 @@ def get_recent_scans(limit=10):
         2025-10-28 14:30:00: Harry Potter (USED)
         2025-10-28 14:28:00: Lord of the Rings (NEW)
     """
+    # Colonnes affichées seulement (pas les textes d'enrichissement)
     query = """
-    SELECT * FROM scans 
+    SELECT id, timestamp, bin, upc, title, condition, quantity, status
+    FROM scans 
     ORDER BY timestamp DESC 
     LIMIT ?
     """
@@ -134,9 +140,17 @@ Version: 1.0
 Date: 2025-10-24
 """
 
+import atexit
+import functools
+import queue
+import re
 import sqlite3
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import config
 
 
@@ -144,19 +158,256 @@ import config
 # CONNEXION & INITIALISATION
 # ========================================================================
 
+# Connexion unique partagée par tous les helpers (ouverte au premier appel).
+# Évite de rouvrir le fichier et de reconstruire le cache de pages à chaque requête.
+_CONN: Optional[sqlite3.Connection] = None
+_CONN_LOCK = threading.RLock()   # ouverture/fermeture des connexions
+
+# Sérialise les écritures (un seul écrivain SQLite à la fois, voir write_tx).
+# Réentrant: une écriture peut s'imbriquer dans transaction().
+_WRITE_LOCK = threading.RLock()
+
+# Profondeur d'imbrication de write_tx() pour le thread courant
+_TX_STATE = threading.local()
+
+# Pool de connexions lecture seule: un écrivain, N lecteurs (MVCC du mode WAL)
+_READ_POOL: Optional[queue.Queue] = None
+
+# PRAGMAs appliqués une seule fois à l'ouverture de la connexion
+_PRAGMAS = (
+    "PRAGMA auto_vacuum=INCREMENTAL",  # avant WAL: seul moment où une base neuve l'accepte
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",     # 64 MB de cache de pages
+    "PRAGMA mmap_size=268435456",   # 256 MB mappés (base de quelques dizaines de Mo)
+    "PRAGMA busy_timeout=5000",     # attend 5 s au lieu d'échouer si la base est verrouillée
+    "PRAGMA recursive_triggers=ON", # INSERT OR REPLACE déclenche aussi les triggers DELETE (index FTS)
+)
+
+# Taille du cache LRU de requêtes préparées du module sqlite3 (défaut: 128)
+_CACHED_STATEMENTS = 256
+
+# Compteur incrémenté à chaque écriture réussie (invalide les caches lecture)
+_DATA_VERSION = 0
+
+# Cache des compteurs coûteux: {nom: (valeur, time.monotonic(), version données)}
+_STAT_CACHE: Dict[str, tuple] = {}
+
+# Durée de vie max d'un compteur en cache (secondes)
+_STAT_TTL = 5.0
+
+# Version du schéma (PRAGMA user_version): migrations appliquées une seule fois
+_SCHEMA_VERSION = 1
+
+# Lignes MANIFEST / dimensions relues à chaque scan: petits caches LRU par UPC
+# (un même livre est souvent scanné plusieurs fois de suite).
+# Vidés à chaque import MANIFEST / sauvegarde de dimensions / rollback.
+_UPC_CACHE_SIZE = 512
+_MANIFEST_ROW_CACHE: "OrderedDict[str, Dict]" = OrderedDict()
+_DIMENSIONS_CACHE: "OrderedDict[str, Dict]" = OrderedDict()
+_UPC_CACHE_LOCK = threading.Lock()
+
+
+def get_data_version() -> int:
+    """
+    Retourne le numéro de version des données (change après chaque écriture).
+    
+    Note:
+        Permet aux caches (ex: métriques dashboard) de savoir si la base
+        a été modifiée depuis leur calcul, sans requête SQL.
+    """
+    return _DATA_VERSION
+
+
+def _bump_data_version():
+    """Signale une écriture (appelée sous _WRITE_LOCK après commit)."""
+    global _DATA_VERSION
+    _DATA_VERSION += 1
+
+
 def get_connection():
     """
-    Crée et retourne une connexion à la base de données.
+    Retourne la connexion partagée à la base de données.
     
     Returns:
         sqlite3.Connection: Connexion active à scans.db
     
     Note:
+        La connexion est ouverte au premier appel puis réutilisée (mode WAL,
+        PRAGMAs optimisés). Ne pas appeler close() dessus: elle est fermée
+        automatiquement à la sortie du programme.
         Row factory permet d'accéder aux colonnes par nom (dict-like)
     """
-    conn = sqlite3.connect(config.DB_PATH)
-    conn.row_factory = sqlite3.Row  # Permet d'accéder aux colonnes par nom
-    return conn
+    global _CONN
+    
+    with _CONN_LOCK:
+        if _CONN is None:
+            # check_same_thread=False: l'enrichissement tourne dans un thread,
+            # les écritures sont sérialisées par _WRITE_LOCK
+            conn = sqlite3.connect(config.DB_PATH, check_same_thread=False,
+                                   cached_statements=_CACHED_STATEMENTS)
+            conn.row_factory = sqlite3.Row  # Permet d'accéder aux colonnes par nom
+            for pragma in _PRAGMAS:
+                conn.execute(pragma)
+            _CONN = conn
+            atexit.register(close_connection)
+        return _CONN
+
+
+def close_connection():
+    """Ferme les connexions partagées (appelée automatiquement à la sortie)."""
+    global _CONN, _READ_POOL
+    
+    with _WRITE_LOCK, _CONN_LOCK:
+        _STAT_CACHE.clear()
+        _clear_upc_caches()
+        if _READ_POOL is not None:
+            while not _READ_POOL.empty():
+                _READ_POOL.get_nowait().close()
+            _READ_POOL = None
+        if _CONN is not None:
+            _CONN.close()
+            _CONN = None
+
+
+def maintenance() -> bool:
+    """
+    Entretien de la base: libère les pages vides, met à jour les
+    statistiques du planificateur et vide le fichier WAL.
+    
+    Returns:
+        bool: True si succès
+    
+    Exemple:
+        >>> maintenance()  # à la fermeture de l'application
+        True
+    
+    Note:
+        Une base créée avant auto_vacuum=INCREMENTAL est convertie une
+        seule fois par un VACUUM complet (quelques secondes au plus).
+    """
+    try:
+        with _WRITE_LOCK:
+            conn = get_connection()
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0:
+                print("🧹 Conversion auto_vacuum=INCREMENTAL (VACUUM)...")
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA incremental_vacuum(1000)").fetchall()
+            conn.execute("PRAGMA optimize")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        return True
+    except sqlite3.Error as e:
+        print(f"❌ Erreur maintenance: {e}")
+        return False
+
+
+def _get_read_pool() -> queue.Queue:
+    """Crée (au premier appel) le pool de connexions lecture seule."""
+    global _READ_POOL
+    
+    with _CONN_LOCK:
+        if _READ_POOL is None:
+            # La connexion d'écriture crée le fichier et active le mode WAL
+            get_connection()
+            
+            uri = f"{config.DB_PATH.absolute().as_uri()}?mode=ro"
+            pool = queue.Queue(maxsize=config.DB_READ_POOL_SIZE)
+            for _ in range(config.DB_READ_POOL_SIZE):
+                conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                       cached_statements=_CACHED_STATEMENTS)
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA query_only=1")
+                conn.execute("PRAGMA busy_timeout=5000")
+                pool.put(conn)
+            _READ_POOL = pool
+        return _READ_POOL
+
+
+@contextmanager
+def read_conn():
+    """
+    Emprunte une connexion lecture seule du pool et la rend à la sortie.
+    
+    Exemple:
+        >>> with read_conn() as conn:
+        ...     conn.execute("SELECT COUNT(*) FROM scans").fetchone()[0]
+        42
+    
+    Note:
+        Bloque si toutes les connexions sont empruntées (DB_READ_POOL_SIZE).
+        Utilisé par fetch_one/fetch_all: les lectures de plusieurs threads
+        s'exécutent en parallèle sans attendre la connexion d'écriture.
+    """
+    pool = _get_read_pool()
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
+
+
+@contextmanager
+def write_tx():
+    """
+    Ouvre une transaction d'écriture sur la connexion partagée.
+    
+    Prend _WRITE_LOCK (un seul écrivain à la fois), commit à la sortie
+    (rollback si exception) puis signale l'écriture aux caches.
+    
+    Exemple:
+        >>> with write_tx() as conn:
+        ...     conn.execute("UPDATE scans SET exported=1 WHERE id=?", (42,))
+    
+    Note:
+        Les lectures passent par read_conn() et ne sont jamais bloquées
+        par une écriture en cours (mode WAL).
+        Imbriqué dans une autre write_tx()/transaction(), ne commit pas:
+        seule la transaction la plus externe commit.
+    """
+    with _WRITE_LOCK:
+        conn = get_connection()
+        depth = getattr(_TX_STATE, 'depth', 0)
+        _TX_STATE.depth = depth + 1
+        try:
+            if depth:
+                yield conn
+                return
+            try:
+                with conn:
+                    yield conn
+            except BaseException:
+                # Le rollback peut annuler des lignes déjà mises en cache
+                _clear_upc_caches()
+                raise
+        finally:
+            _TX_STATE.depth = depth
+        _bump_data_version()
+
+
+@contextmanager
+def transaction():
+    """
+    Regroupe plusieurs écritures (insert_scan, save_dimensions_for_upc...)
+    en une seule transaction: un BEGIN IMMEDIATE, un seul commit.
+    
+    Exemple:
+        >>> with transaction():
+        ...     save_dimensions_for_upc(upc, dims)
+        ...     insert_scan(scan_data)
+    
+    Note:
+        Une exception levée dans le bloc annule tout. Les helpers qui
+        interceptent leurs propres erreurs (execute_query...) retournent
+        False sans annuler le reste.
+        Les lectures (fetch_one, fetch_all) passent par le pool lecture
+        seule: elles ne voient les écritures du bloc qu'après le commit.
+    """
+    with write_tx() as conn:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        yield conn
 
 
 def init_database():
@@ -174,6 +425,10 @@ def init_database():
     conn = get_connection()
     cursor = conn.cursor()
     
+    # WAL est persistant dans le fichier: le fixer ici le garantit même
+    # pour les outils qui ouvrent la base sans passer par get_connection()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     # Table MANIFEST (inventaire initial)
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS manifest (
@@ -267,25 +522,145 @@ def init_database():
     )
     """)
     
+    # Table API_CACHE (réponses Google Books / OpenLibrary déjà analysées)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS api_cache (
+        source TEXT NOT NULL,
+        upc TEXT NOT NULL,
+        payload TEXT,
+        fetched_at INTEGER NOT NULL,
+        PRIMARY KEY (source, upc)
+    ) WITHOUT ROWID
+    """)
+    
+    # Migrations ponctuelles, suivies par PRAGMA user_version (0 = base d'avant)
+    user_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if user_version < _SCHEMA_VERSION:
+        # v1: conditions en majuscules (insert_scans_many les normalise désormais)
+        if user_version < 1:
+            cursor.execute("UPDATE scans SET condition = UPPER(condition) WHERE condition != UPPER(condition)")
+        cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    
     # Index pour optimiser les recherches
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_scans_upc ON scans(upc)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_scans_bin ON scans(bin)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scans_enriched ON scans(enriched)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scans_exported ON scans(exported)")
+    # (enriched, upc): COUNT(DISTINCT upc) WHERE enriched = ? sans lire la table
+    cursor.execute("DROP INDEX IF EXISTS idx_scans_enriched")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scans_enriched_upc ON scans(enriched, upc)")
+    # Index partiel: seulement les scans exportés (COUNT(*) WHERE exported = 1)
+    cursor.execute("DROP INDEX IF EXISTS idx_scans_exported")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_scans_exported_only
+        ON scans(id) WHERE exported = 1
+    """)
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_scans_status ON scans(status)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_upc ON sales(upc)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_manifest_upc ON manifest(upc)")
     
+    # Index dashboard: plage de dates + regroupements couvrants (quantity incluse)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scans_ts ON scans(timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scans_status_qty ON scans(status, quantity)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scans_cond_qty ON scans(condition, quantity)")
+    # Couvrant pour get_unenriched_scans (filtre + tri + colonnes lues dans l'index).
+    # Partiel: ne contient que les scans à enrichir, reste petit quand tout est enrichi.
+    cursor.execute("DROP INDEX IF EXISTS idx_scans_unenriched")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_scans_unenriched_only
+        ON scans(enriched, timestamp DESC, upc, title, condition)
+        WHERE enriched = 0
+    """)
+    
+    # Index plein texte du MANIFEST (search_manifest), synchronisé par triggers
+    _create_manifest_fts(cursor)
+    
     conn.commit()
-    conn.close()
     
     print("✅ Base de données initialisée avec succès!")
 
 
+def _create_manifest_fts(cursor):
+    """
+    Crée la table FTS5 manifest_fts (upc, title) et ses triggers.
+    
+    Table à contenu externe: le texte reste dans manifest, seul l'index
+    inversé est stocké. Si la table vient d'être créée sur une base déjà
+    remplie, l'index est reconstruit une fois.
+    
+    Note:
+        Si SQLite est compilé sans FTS5, rien n'est créé et search_manifest
+        retombe sur LIKE.
+    """
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'manifest_fts'"
+    ).fetchone()
+    
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS manifest_fts USING fts5(
+                upc, title,
+                content='manifest', content_rowid='id',
+                tokenize='unicode61'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"⚠️ FTS5 indisponible, recherche MANIFEST par LIKE: {e}")
+        return
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS manifest_fts_ai AFTER INSERT ON manifest BEGIN
+            INSERT INTO manifest_fts(rowid, upc, title)
+            VALUES (new.id, new.upc, new.title);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS manifest_fts_ad AFTER DELETE ON manifest BEGIN
+            INSERT INTO manifest_fts(manifest_fts, rowid, upc, title)
+            VALUES ('delete', old.id, old.upc, old.title);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS manifest_fts_au AFTER UPDATE OF upc, title ON manifest BEGIN
+            INSERT INTO manifest_fts(manifest_fts, rowid, upc, title)
+            VALUES ('delete', old.id, old.upc, old.title);
+            INSERT INTO manifest_fts(rowid, upc, title)
+            VALUES (new.id, new.upc, new.title);
+        END
+    """)
+    
+    if not exists:
+        cursor.execute("INSERT INTO manifest_fts(manifest_fts) VALUES ('rebuild')")
+
+
 # ========================================================================
 # FONCTIONS UTILITAIRES
 # ========================================================================
 
+def _cached_stat(func):
+    """
+    Met en cache le résultat d'un compteur sans argument (SUM/COUNT).
+    
+    La valeur est réutilisée pendant _STAT_TTL secondes, tant qu'aucune
+    écriture n'a eu lieu (get_data_version): un scan ou un import MANIFEST
+    invalide donc immédiatement le cache.
+    """
+    name = func.__name__
+    
+    @functools.wraps(func)
+    def wrapper():
+        now = time.monotonic()
+        version = _DATA_VERSION
+        cached = _STAT_CACHE.get(name)
+        
+        if cached and cached[2] == version and now - cached[1] < _STAT_TTL:
+            return cached[0]
+        
+        value = func()
+        _STAT_CACHE[name] = (value, now, version)
+        return value
+    
+    return wrapper
+
+
 def execute_query(query: str, params: tuple = ()) -> bool:
     """
     Exécute une requête SQL (INSERT, UPDATE, DELETE).
@@ -302,17 +677,39 @@ def execute_query(query: str, params: tuple = ()) -> bool:
         True
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        conn.commit()
-        conn.close()
+        with write_tx() as conn:  # commit auto (rollback si erreur)
+            conn.execute(query, params)
         return True
     except Exception as e:
         print(f"❌ Erreur execute_query: {e}")
         return False
 
 
+def execute_many(query: str, params_list) -> bool:
+    """
+    Exécute une même requête SQL pour plusieurs jeux de paramètres,
+    dans une seule transaction (une seule préparation, un seul commit).
+    
+    Args:
+        query: Requête SQL à exécuter (INSERT, UPDATE, DELETE)
+        params_list: Itérable de tuples de paramètres
+    
+    Returns:
+        bool: True si succès, False sinon (rien n'est écrit en cas d'erreur)
+    
+    Exemple:
+        >>> execute_many("UPDATE scans SET exported=1 WHERE id=?", [(1,), (2,)])
+        True
+    """
+    try:
+        with write_tx() as conn:
+            conn.executemany(query, params_list)
+        return True
+    except Exception as e:
+        print(f"❌ Erreur execute_many: {e}")
+        return False
+
+
 def fetch_one(query: str, params: tuple = ()) -> Optional[Dict]:
     """
     Exécute une requête SELECT et retourne UN résultat.
@@ -329,11 +726,8 @@ def fetch_one(query: str, params: tuple = ()) -> Optional[Dict]:
         {'id': 1, 'upc': '9781234567890', 'title': 'Mon livre', ...}
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-        conn.close()
+        with read_conn() as conn:
+            result = conn.execute(query, params).fetchone()
         
         if result:
             return dict(result)
@@ -359,11 +753,8 @@ def fetch_all(query: str, params: tuple = ()) -> List[Dict]:
         [{'id': 1, 'upc': '...', ...}, {'id': 2, ...}, ...]
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        conn.close()
+        with read_conn() as conn:
+            results = conn.execute(query, params).fetchall()
         
         return [dict(row) for row in results]
     except Exception as e:
@@ -371,6 +762,177 @@ def fetch_all(query: str, params: tuple = ()) -> List[Dict]:
         return []
 
 
+def fetch_all_rows(query: str, params: tuple = ()) -> List[sqlite3.Row]:
+    """
+    Comme fetch_all(), mais retourne directement les sqlite3.Row.
+    
+    Pas de dict créé par ligne: à préférer quand l'appelant se contente
+    de lire quelques colonnes (row['col'] fonctionne de la même façon).
+    
+    Args:
+        query: Requête SQL SELECT
+        params: Paramètres de la requête (tuple)
+    
+    Returns:
+        list: Liste de sqlite3.Row (accès par nom ou par index)
+    
+    Exemple:
+        >>> rows = fetch_all_rows("SELECT condition, SUM(quantity) as count FROM scans GROUP BY condition")
+        >>> rows[0]['condition']
+        'USED'
+    """
+    try:
+        with read_conn() as conn:
+            return conn.execute(query, params).fetchall()
+    except Exception as e:
+        print(f"❌ Erreur fetch_all_rows: {e}")
+        return []
+
+
+def iter_rows(query: str, params: tuple = ()) -> Iterator[sqlite3.Row]:
+    """
+    Exécute une requête SELECT et itère sur les lignes sans tout charger.
+    
+    Les lignes sont lues au fur et à mesure depuis le curseur: mémoire
+    constante quel que soit le nombre de lignes (agrégations, exports).
+    
+    Args:
+        query: Requête SQL SELECT
+        params: Paramètres de la requête (tuple)
+    
+    Yields:
+        sqlite3.Row: Une ligne à la fois (accès par nom ou par index)
+    
+    Exemple:
+        >>> total = sum(row['quantity'] for row in iter_rows("SELECT quantity FROM sales"))
+    
+    Note:
+        La connexion lecture reste empruntée au pool tant que l'itération
+        n'est pas terminée: consommer le générateur jusqu'au bout (ou le
+        fermer) pour la rendre.
+    """
+    try:
+        with read_conn() as conn:
+            yield from conn.execute(query, params)
+    except sqlite3.Error as e:
+        print(f"❌ Erreur iter_rows: {e}")
+
+
+@functools.lru_cache(maxsize=64)
+def _row_type(columns: tuple):
+    """Construit (une seule fois par jeu de colonnes) le namedtuple d'une requête."""
+    return namedtuple('Row', columns, rename=True)
+
+
+def fetch_all_as(query: str, params: tuple = ()) -> List[tuple]:
+    """
+    Exécute une requête SELECT et retourne des namedtuple (row.col).
+    
+    Le type namedtuple est dérivé de cursor.description et mis en cache:
+    plus léger qu'un dict par ligne, et immuable.
+    
+    Args:
+        query: Requête SQL SELECT
+        params: Paramètres de la requête (tuple)
+    
+    Returns:
+        list: Liste de namedtuple (un par ligne)
+    
+    Exemple:
+        >>> scans = fetch_all_as("SELECT id, upc FROM scans")
+        >>> scans[0].upc
+        '9781234567890'
+    
+    Note:
+        Les noms de colonnes invalides en Python (ex: COUNT(*)) sont
+        renommés _0, _1... : utiliser des alias (AS count).
+    """
+    try:
+        with read_conn() as conn:
+            cursor = conn.execute(query, params)
+            if cursor.description is None:
+                return []
+            row_type = _row_type(tuple(col[0] for col in cursor.description))
+            return [row_type._make(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"❌ Erreur fetch_all_as: {e}")
+        return []
+
+
+# ========================================================================
+# REQUÊTES FRÉQUENTES (appelées à chaque scan)
+# ========================================================================
+# Texte SQL identique à chaque appel → toujours servi par le cache de
+# requêtes préparées de la connexion (cached_statements).
+
+# Horodatage calculé par SQLite, même format que datetime.now().isoformat()
+# (heure locale, séparateur 'T'): pas de chaîne Python créée par ligne écrite
+_SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+_Q_CHECK_UPC = "SELECT 1 FROM manifest WHERE upc = ? LIMIT 1"
+_Q_MANIFEST_BY_UPC = "SELECT * FROM manifest WHERE upc = ?"
+_Q_BIN_FOR_UPC = "SELECT DISTINCT bin FROM scans WHERE upc = ? LIMIT 1"
+_Q_SCANS_BY_UPC = """
+SELECT id, timestamp, bin, upc, condition, quantity, qty_vendue, status
+FROM scans
+WHERE upc = ?
+ORDER BY timestamp DESC
+"""
+# Condition → eBay Condition ID enregistré avec le scan
+_SCAN_CONDITION_IDS = {
+    'NEW': '1000',
+    'GOOD': '2750',
+    'USED': '5000',
+    'DONATION': ''
+}
+# Une seule instruction: les infos MANIFEST (pallet, sku, title, msrp) sont
+# jointes directement dans l'INSERT, pas de SELECT séparé avant chaque scan
+_Q_INSERT_SCAN = f"""
+INSERT INTO scans (
+    timestamp, bin, upc, condition, quantity,
+    weight_major, weight_minor, pkg_length, pkg_depth, pkg_width,
+    pallet, sku, title, msrp,
+    ebay_condition_id, status
+)
+SELECT
+    {_SQL_NOW}, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+    COALESCE(m.pallet, ''),
+    COALESCE(m.sku, ''),
+    COALESCE(m.title, ?),
+    COALESCE(m.msrp, 0.0),
+    ?,
+    'En attente'
+FROM (SELECT ? as upc) p
+LEFT JOIN manifest m ON m.upc = p.upc
+LIMIT 1
+"""
+_DIMENSION_KEYS = ('weight_major', 'weight_minor', 'pkg_length', 'pkg_depth', 'pkg_width')
+_Q_DIMENSIONS_OR_SCAN = """
+SELECT weight_major, weight_minor, pkg_length, pkg_depth, pkg_width, 'cache' as src
+FROM dimensions
+WHERE upc = ?
+UNION ALL
+SELECT weight_major, weight_minor, pkg_length, pkg_depth, pkg_width, 'scan' as src
+FROM scans
+WHERE upc = ?
+AND (weight_major > 0 OR weight_minor > 0 OR pkg_length > 0)
+LIMIT 1
+"""
+_Q_ADD_QTY_VENDUE = "UPDATE scans SET qty_vendue = qty_vendue + ? WHERE id = ?"
+# {ids}: "?,?,...,?" (un paquet d'au plus _IN_CHUNK IDs, numérotés après ?1)
+_Q_UPDATE_SCAN_EXPORTED = f"""
+UPDATE scans
+SET exported = ?1,
+    exported_date = CASE WHEN ?1 THEN {_SQL_NOW} ELSE NULL END
+WHERE id IN ({{ids}})
+"""
+_Q_INSERT_MANIFEST = """
+INSERT OR REPLACE INTO manifest 
+(pallet, upc, sku, quantity, category, title, msrp)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 # ========================================================================
 # MANIFEST - Inventaire initial
 # ========================================================================
@@ -388,13 +950,38 @@ def check_upc_in_manifest(upc: str) -> bool:
     Exemple:
         >>> check_upc_in_manifest("9781234567890")
         True
-    """
-    query = "SELECT COUNT(*) as count FROM manifest WHERE upc = ?"
-    result = fetch_one(query, (upc,))
     
-    if result:
-        return result['count'] > 0
-    return False
+    Note:
+        Appelée à chaque scan: SELECT 1 ... LIMIT 1 s'arrête à la première
+        correspondance dans l'index sur upc.
+    """
+    return fetch_one(_Q_CHECK_UPC, (upc,)) is not None
+
+
+def _lru_get(cache: OrderedDict, upc: str) -> Optional[Dict]:
+    """Lit une ligne du cache LRU (copie), None si absente."""
+    with _UPC_CACHE_LOCK:
+        row = cache.get(upc)
+        if row is None:
+            return None
+        cache.move_to_end(upc)
+        return dict(row)
+
+
+def _lru_put(cache: OrderedDict, upc: str, row: Dict) -> None:
+    """Ajoute une ligne au cache LRU (évince la plus ancienne si plein)."""
+    with _UPC_CACHE_LOCK:
+        cache[upc] = dict(row)
+        cache.move_to_end(upc)
+        if len(cache) > _UPC_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _clear_upc_caches() -> None:
+    """Vide les caches LRU MANIFEST / dimensions."""
+    with _UPC_CACHE_LOCK:
+        _MANIFEST_ROW_CACHE.clear()
+        _DIMENSIONS_CACHE.clear()
 
 
 def get_manifest_data(upc: str) -> Optional[Dict]:
@@ -411,12 +998,57 @@ def get_manifest_data(upc: str) -> Optional[Dict]:
     Exemple:
         >>> get_manifest_data("9781234567890")
         {'upc': '9781234567890', 'title': 'Mon livre', 'msrp': 27.29, ...}
+    
+    Note:
+        Les UPCs trouvés sont gardés dans un cache LRU (_UPC_CACHE_SIZE):
+        rescanner le même livre ne relit pas la base.
     """
-    query = """
-    SELECT * FROM manifest 
-    WHERE upc = ?
+    row = _lru_get(_MANIFEST_ROW_CACHE, upc)
+    if row is not None:
+        return row
+    
+    row = fetch_one(_Q_MANIFEST_BY_UPC, (upc,))
+    if row:
+        _lru_put(_MANIFEST_ROW_CACHE, upc, row)
+    return row
+
+
+# Taille des paquets IN (?, ?, ...): sous la limite de 999 paramètres de SQLite
+_IN_CHUNK = 500
+
+
+def get_manifest_data_bulk(upcs: List[str]) -> Dict[str, Dict]:
     """
-    return fetch_one(query, (upc,))
+    Retourne les infos MANIFEST de plusieurs UPCs en une passe.
+    
+    Une requête WHERE upc IN (...) par paquet de 500 UPCs au lieu d'un
+    get_manifest_data() par UPC.
+    
+    Args:
+        upcs: Codes UPC (doublons et UPCs absents acceptés)
+    
+    Returns:
+        dict: {upc: données MANIFEST}, sans entrée pour les UPCs non trouvés
+    
+    Exemple:
+        >>> get_manifest_data_bulk(["9781234567890", "0000000000000"])
+        {'9781234567890': {'upc': '9781234567890', 'title': 'Mon livre', ...}}
+    """
+    unique = list(dict.fromkeys(upcs))
+    result = {}
+    
+    try:
+        with read_conn() as conn:
+            for start in range(0, len(unique), _IN_CHUNK):
+                chunk = unique[start:start + _IN_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                query = f"SELECT * FROM manifest WHERE upc IN ({placeholders})"
+                for row in conn.execute(query, chunk):
+                    result[row['upc']] = dict(row)
+    except sqlite3.Error as e:
+        print(f"❌ Erreur lecture MANIFEST groupée: {e}")
+    
+    return result
 
 
 def insert_manifest_item(data: Dict) -> bool:
@@ -441,23 +1073,46 @@ def insert_manifest_item(data: Dict) -> bool:
         ... })
         True
     """
-    query = """
-    INSERT OR REPLACE INTO manifest 
-    (pallet, upc, sku, quantity, category, title, msrp)
-    VALUES (?, ?, ?, ?, ?, ?, ?)
+    return insert_manifest_items_bulk([data])
+
+
+def insert_manifest_items_bulk(rows: List[Dict]) -> bool:
     """
+    Insère (ou remplace) plusieurs items du MANIFEST en une seule transaction.
     
-    params = (
-        data.get('pallet', ''),
-        data.get('upc', ''),
-        data.get('sku', ''),
-        data.get('quantity', 0),
-        data.get('category', ''),
-        data.get('title', ''),
-        data.get('msrp', 0.0)
-    )
+    Un seul commit pour tout le lot au lieu d'un commit par ligne:
+    l'import d'un MANIFEST de 14 000 lignes ne fait plus qu'un fsync.
     
-    return execute_query(query, params)
+    Args:
+        rows: Liste de dictionnaires (mêmes clés que insert_manifest_item)
+    
+    Returns:
+        bool: True si succès (en cas d'erreur, aucune ligne n'est écrite)
+    
+    Exemple:
+        >>> insert_manifest_items_bulk([item1, item2, item3])
+        True
+    """
+    params_list = [
+        (
+            data.get('pallet', ''),
+            data.get('upc', ''),
+            data.get('sku', ''),
+            data.get('quantity', 0),
+            data.get('category', ''),
+            data.get('title', ''),
+            data.get('msrp', 0.0)
+        )
+        for data in rows
+    ]
+    
+    success = execute_many(_Q_INSERT_MANIFEST, params_list)
+    
+    if success:
+        with _UPC_CACHE_LOCK:
+            _MANIFEST_ROW_CACHE.clear()  # lignes remplacées par INSERT OR REPLACE
+    
+    return success
 
 
 # ========================================================================
@@ -482,14 +1137,7 @@ def get_bin_for_upc(upc: str) -> Optional[str]:
         Utilisé pour vérifier les conflits de BIN (un UPC doit toujours
         être dans le même BIN physique)
     """
-    query = """
-    SELECT DISTINCT bin 
-    FROM scans 
-    WHERE upc = ? 
-    LIMIT 1
-    """
-    
-    result = fetch_one(query, (upc,))
+    result = fetch_one(_Q_BIN_FOR_UPC, (upc,))
     
     if result:
         return result['bin']
@@ -519,60 +1167,105 @@ def insert_scan(data: Dict) -> Optional[int]:
         ...     'title': 'Mon livre'
         ... })
         42  # ID du scan
+    
+    Note:
+        Raccourci pour insert_scans_many() avec un seul scan.
+    """
+    scan_ids = insert_scans_many([data])
+    return scan_ids[0] if scan_ids else None
+
+
+def insert_scans_many(scans: List[Dict]) -> List[int]:
+    """
+    Insère plusieurs scans en une seule transaction (rafale de scans).
+    
+    Un seul executemany + un seul commit. Les infos MANIFEST sont
+    jointes dans l'INSERT lui-même (voir _Q_INSERT_SCAN). La condition
+    est enregistrée en majuscules: les lectures la comparent telle quelle.
+    
+    Args:
+        scans: Liste de dictionnaires (mêmes clés que insert_scan)
+    
+    Returns:
+        list: IDs des scans insérés (même ordre que scans), [] si erreur
+    
+    Exemple:
+        >>> insert_scans_many([scan1, scan2, scan3])
+        [42, 43, 44]
     """
+    if not scans:
+        return []
+    
     try:
-        # Récupère infos MANIFEST si disponibles
-        manifest = get_manifest_data(data['upc'])
+        def rows():
+            for data in scans:
+                condition = data['condition'].upper()
+                yield (
+                    data['bin'],
+                    data['upc'],
+                    condition,
+                    data['quantity'],
+                    data.get('weight_major', 0),
+                    data.get('weight_minor', 0),
+                    data.get('pkg_length', 0),
+                    data.get('pkg_depth', 0),
+                    data.get('pkg_width', 0),
+                    data.get('title', ''),  # si UPC absent du MANIFEST
+                    _SCAN_CONDITION_IDS.get(condition, ''),
+                    data['upc']             # jointure MANIFEST
+                )
         
-        query = """
-        INSERT INTO scans (
-            timestamp, bin, upc, condition, quantity,
-            weight_major, weight_minor, pkg_length, pkg_depth, pkg_width,
-            pallet, sku, title, msrp,
-            ebay_condition_id, status
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+        with write_tx() as conn:
+            conn.executemany(_Q_INSERT_SCAN, rows())
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
         
-        # Mapping condition → eBay Condition ID
-        condition_map = {
-            'NEW': '1000',
-            'GOOD': '2750',
-            'USED': '5000',
-            'DONATION': ''
-        }
-        
-        params = (
-            datetime.now().isoformat(),
-            data['bin'],
-            data['upc'],
-            data['condition'],
-            data['quantity'],
-            data.get('weight_major', 0),
-            data.get('weight_minor', 0),
-            data.get('pkg_length', 0),
-            data.get('pkg_depth', 0),
-            data.get('pkg_width', 0),
-            manifest['pallet'] if manifest else '',
-            manifest['sku'] if manifest else '',
-            manifest['title'] if manifest else data.get('title', ''),
-            manifest['msrp'] if manifest else 0.0,
-            condition_map.get(data['condition'], ''),
-            'En attente'
-        )
-        
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        scan_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return scan_id
+        # Un seul écrivain (_WRITE_LOCK) + AUTOINCREMENT: IDs consécutifs
+        return list(range(last_id - len(scans) + 1, last_id + 1))
         
     except Exception as e:
-        print(f"❌ Erreur insert_scan: {e}")
-        return None
+        print(f"❌ Erreur insert_scans_many: {e}")
+        return []
+
+
+class ScanBatch:
+    """
+    Lot de scans accumulés par scan_transaction().
+    
+    Attributs:
+        scans: Scans en attente d'insertion
+        ids: IDs des scans insérés (rempli à la sortie du bloc with)
+    """
+    
+    def __init__(self):
+        self.scans: List[Dict] = []
+        self.ids: List[int] = []
+    
+    def insert(self, data: Dict) -> None:
+        """Ajoute un scan au lot (mêmes clés que insert_scan)."""
+        self.scans.append(data)
+
+
+@contextmanager
+def scan_transaction():
+    """
+    Regroupe plusieurs insertions de scans en une seule transaction.
+    
+    Les scans sont insérés d'un coup (executemany, un seul commit) à la
+    sortie du bloc. Si une exception survient dans le bloc, rien n'est écrit.
+    
+    Exemple:
+        >>> with scan_transaction() as tx:
+        ...     tx.insert(scan1)
+        ...     tx.insert(scan2)
+        >>> tx.ids
+        [42, 43]
+    
+    Note:
+        Pour les imports/rattrapages: N scans = 1 fsync au lieu de N.
+    """
+    batch = ScanBatch()
+    yield batch
+    batch.ids = insert_scans_many(batch.scans)
 
 
 def get_scans_by_upc(upc: str) -> List[Dict]:
@@ -583,14 +1276,27 @@ def get_scans_by_upc(upc: str) -> List[Dict]:
         upc: Code UPC du livre
     
     Returns:
-        list: Liste de tous les scans de ce livre
+        list: Liste de tous les scans de ce livre (colonnes principales,
+              sans les textes d'enrichissement)
     """
-    query = """
-    SELECT * FROM scans 
-    WHERE upc = ?
-    ORDER BY timestamp DESC
+    return fetch_all(_Q_SCANS_BY_UPC, (upc,))
+
+
+def iter_scans_by_upc(upc: str) -> Iterator[sqlite3.Row]:
     """
-    return fetch_all(query, (upc,))
+    Itère sur les scans d'un UPC (mêmes colonnes que get_scans_by_upc).
+    
+    Args:
+        upc: Code UPC du livre
+    
+    Yields:
+        sqlite3.Row: Un scan à la fois
+    
+    Exemple:
+        >>> sum(scan['quantity'] for scan in iter_scans_by_upc("9781234567890"))
+        3
+    """
+    return iter_rows(_Q_SCANS_BY_UPC, (upc,))
 
 
 def get_total_scanned_for_upc(upc: str) -> int:
@@ -619,6 +1325,25 @@ def get_total_scanned_for_upc(upc: str) -> int:
     return 0
 
 
+def get_unexported_scans() -> List[Dict]:
+    """
+    Retourne les scans enrichis pas encore exportés vers eBay.
+    
+    Returns:
+        list: Scans complets où enriched = 1 et exported = 0 (condition
+              en majuscules), du plus ancien au plus récent
+    
+    Note:
+        Utilisé par ebay_export_module (génération CSV, aperçu, validation).
+    """
+    query = """
+    SELECT * FROM scans
+    WHERE enriched = 1 AND exported = 0
+    ORDER BY timestamp
+    """
+    return fetch_all(query)
+
+
 def get_unenriched_scans() -> List[Dict]:
     """
     Retourne tous les scans qui n'ont pas encore été enrichis.
@@ -639,6 +1364,44 @@ def get_unenriched_scans() -> List[Dict]:
     return fetch_all(query)
 
 
+def get_unenriched_scan_ids() -> Dict[str, List[int]]:
+    """
+    Associe chaque UPC non enrichi aux IDs de ses scans non enrichis (enriched = 0).
+    
+    Returns:
+        dict: {upc: [scan_id, ...]} (IDs croissants)
+    
+    Exemple:
+        >>> get_unenriched_scan_ids()
+        {'9781234567890': [12, 14], '9780987654321': [15]}
+    
+    Note:
+        Sert à retrouver les scans à mettre à jour après enrichissement
+        (get_unenriched_scans ne retourne pas les IDs). Un même UPC peut
+        avoir plusieurs scans (conditions différentes): tous sont retournés.
+    """
+    scan_ids: Dict[str, List[int]] = {}
+    for upc, scan_id in fetch_all_as("SELECT upc, id FROM scans WHERE enriched = 0 ORDER BY id"):
+        scan_ids.setdefault(upc, []).append(scan_id)
+    return scan_ids
+
+
+def get_unenriched_upcs() -> List[str]:
+    """
+    Retourne les UPCs distincts des scans non enrichis (enriched = 0).
+    
+    Returns:
+        list: UPCs sans doublon (dédoublonnés par SQLite, index couvrant
+        idx_scans_enriched_upc)
+    
+    Exemple:
+        >>> get_unenriched_upcs()
+        ['9781234567890', '9780987654321']
+    """
+    query = "SELECT DISTINCT upc FROM scans WHERE enriched = 0"
+    return [row[0] for row in fetch_all_as(query)]
+
+
 def mark_scans_as_enriched(upc: str, enrichment_data: Dict) -> bool:
     """
     Marque un UPC comme enrichi et ajoute les métadonnées.
@@ -651,10 +1414,10 @@ def mark_scans_as_enriched(upc: str, enrichment_data: Dict) -> bool:
     Returns:
         bool: True si succès
     """
-    query = """
+    query = f"""
     UPDATE scans 
     SET enriched = 1,
-        enriched_date = ?,
+        enriched_date = {_SQL_NOW},
         author = ?,
         publisher = ?,
         pub_year = ?,
@@ -669,7 +1432,6 @@ def mark_scans_as_enriched(upc: str, enrichment_data: Dict) -> bool:
     """
     
     params = (
-        datetime.now().isoformat(),
         enrichment_data.get('author', ''),
         enrichment_data.get('publisher', ''),
         enrichment_data.get('pub_year', ''),
@@ -683,7 +1445,31 @@ def mark_scans_as_enriched(upc: str, enrichment_data: Dict) -> bool:
         upc
     )
     
-    return execute_query(query, params)
+    return execute_query(query, params)
+
+
+def _set_scans_exported(scan_ids: List[int], exported: bool) -> Optional[int]:
+    """
+    Met à jour le flag exported par paquets IN (...) de _IN_CHUNK IDs,
+    tous dans une seule transaction.
+    
+    Returns:
+        int: Nombre de lignes modifiées, None si erreur (rien n'est écrit)
+    """
+    export_value = 1 if exported else 0
+    updated = 0
+    
+    try:
+        with write_tx() as conn:
+            for start in range(0, len(scan_ids), _IN_CHUNK):
+                chunk = scan_ids[start:start + _IN_CHUNK]
+                # Les paquets pleins ont le même texte SQL: requête préparée réutilisée
+                query = _Q_UPDATE_SCAN_EXPORTED.format(ids=",".join("?" * len(chunk)))
+                updated += conn.execute(query, (export_value, *chunk)).rowcount
+        return updated
+    except sqlite3.Error as e:
+        print(f"❌ Erreur mise à jour exported: {e}")
+        return None
 
 
 def update_scan_exported(scan_ids: List[int], exported: bool = True) -> bool:
@@ -700,24 +1486,34 @@ def update_scan_exported(scan_ids: List[int], exported: bool = True) -> bool:
     Exemple:
         >>> update_scan_exported([1, 2, 3, 4, 5], exported=True)
         True
+    
+    Note:
+        exported_date est rempli par SQLite (NULL si exported=0).
     """
     if not scan_ids:
         return True
     
-    placeholders = ','.join('?' * len(scan_ids))
-    query = f"""
-    UPDATE scans 
-    SET exported = ?,
-        exported_date = ?
-    WHERE id IN ({placeholders})
+    return _set_scans_exported(scan_ids, exported) is not None
+
+
+def mark_scans_as_exported(scan_ids: List[int]) -> int:
     """
+    Marque des scans comme exportés vers eBay.
     
-    export_value = 1 if exported else 0
-    export_date = datetime.now().isoformat() if exported else None
+    Args:
+        scan_ids: Liste des IDs de scans exportés
     
-    params = (export_value, export_date) + tuple(scan_ids)
+    Returns:
+        int: Nombre de scans marqués (0 si erreur)
     
-    return execute_query(query, params)
+    Note:
+        Utilisé par ebay_export_module.generate_ebay_csv(), une fois par
+        export: un UPDATE ... WHERE id IN (...) par 500 IDs, un seul commit.
+    """
+    if not scan_ids:
+        return 0
+    
+    return _set_scans_exported(scan_ids, True) or 0
 
 
 def get_recent_scans(limit: int = 50) -> List[Dict]:
@@ -730,8 +1526,10 @@ def get_recent_scans(limit: int = 50) -> List[Dict]:
     Returns:
         list: Liste des scans récents
     """
+    # Colonnes affichées seulement (pas les textes d'enrichissement)
     query = """
-    SELECT * FROM scans 
+    SELECT id, timestamp, bin, upc, title, condition, quantity, status
+    FROM scans 
     ORDER BY timestamp DESC 
     LIMIT ?
     """
@@ -772,31 +1570,22 @@ def get_dimensions_for_upc(upc: str) -> Optional[Dict]:
         {'weight_major': 0, 'weight_minor': 750, 'pkg_length': 23, ...}
     
     Note:
-        Vérifie d'abord la table dimensions, puis cherche dans scans
-    """
-    # D'abord, cherche dans le cache dimensions
-    query = """
-    SELECT * FROM dimensions 
-    WHERE upc = ?
+        Vérifie d'abord la table dimensions, puis cherche dans scans.
+        Les dimensions trouvées restent en cache LRU mémoire.
     """
-    result = fetch_one(query, (upc,))
-    
-    if result:
+    result = _lru_get(_DIMENSIONS_CACHE, upc)
+    if result is not None:
         return result
     
-    # Sinon, cherche dans scans (si déjà scanné avant)
-    query = """
-    SELECT weight_major, weight_minor, pkg_length, pkg_depth, pkg_width
-    FROM scans 
-    WHERE upc = ?
-    AND (weight_major > 0 OR weight_minor > 0 OR pkg_length > 0)
-    LIMIT 1
-    """
-    result = fetch_one(query, (upc,))
+    # Cache dimensions d'abord, sinon scans (si déjà scanné avant):
+    # une seule requête, LIMIT 1 arrête dès la première ligne trouvée
+    result = fetch_one(_Q_DIMENSIONS_OR_SCAN, (upc, upc))
     
     if result:
-        # Sauvegarde dans cache pour la prochaine fois
-        save_dimensions_for_upc(upc, result)
+        if result.pop('src') == 'scan':
+            # Sauvegarde dans cache pour la prochaine fois
+            save_dimensions_for_upc(upc, result)
+        _lru_put(_DIMENSIONS_CACHE, upc, result)
         return result
     
     return None
@@ -824,10 +1613,19 @@ def save_dimensions_for_upc(upc: str, dimensions: Dict) -> bool:
         ... })
         True
     """
-    query = """
-    INSERT OR REPLACE INTO dimensions 
+    # Upsert: met à jour la ligne existante en place (pas de DELETE + INSERT
+    # comme INSERT OR REPLACE)
+    query = f"""
+    INSERT INTO dimensions 
     (upc, weight_major, weight_minor, pkg_length, pkg_depth, pkg_width, last_updated)
-    VALUES (?, ?, ?, ?, ?, ?, ?)
+    VALUES (?, ?, ?, ?, ?, ?, {_SQL_NOW})
+    ON CONFLICT(upc) DO UPDATE SET
+        weight_major = excluded.weight_major,
+        weight_minor = excluded.weight_minor,
+        pkg_length = excluded.pkg_length,
+        pkg_depth = excluded.pkg_depth,
+        pkg_width = excluded.pkg_width,
+        last_updated = excluded.last_updated
     """
     
     params = (
@@ -836,11 +1634,73 @@ def save_dimensions_for_upc(upc: str, dimensions: Dict) -> bool:
         dimensions.get('weight_minor', 0),
         dimensions.get('pkg_length', 0),
         dimensions.get('pkg_depth', 0),
-        dimensions.get('pkg_width', 0),
-        datetime.now().isoformat()
+        dimensions.get('pkg_width', 0)
     )
     
-    return execute_query(query, params)
+    success = execute_query(query, params)
+    
+    # Cache à jour tout de suite (vidé si la transaction englobante échoue)
+    if success:
+        _lru_put(_DIMENSIONS_CACHE, upc, dict(zip(_DIMENSION_KEYS, params[1:])))
+    else:
+        with _UPC_CACHE_LOCK:
+            _DIMENSIONS_CACHE.pop(upc, None)
+    
+    return success
+
+
+# ========================================================================
+# CACHE API - Réponses Google Books / OpenLibrary
+# ========================================================================
+
+_Q_GET_API_CACHE = """
+SELECT payload FROM api_cache
+WHERE source = ? AND upc = ? AND fetched_at > ?
+"""
+_Q_SAVE_API_CACHE = """
+INSERT INTO api_cache (source, upc, payload, fetched_at)
+VALUES (?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+ON CONFLICT(source, upc) DO UPDATE SET
+    payload = excluded.payload,
+    fetched_at = excluded.fetched_at
+"""
+
+
+def get_api_cache(source: str, upc: str, max_age: Optional[float]) -> Optional[str]:
+    """
+    Retourne la réponse API en cache pour (source, upc) si assez récente.
+    
+    Args:
+        source: Nom de l'API ('google_books', 'openlibrary')
+        upc: Code UPC du livre
+        max_age: Âge maximum accepté (secondes), None = sans limite
+    
+    Returns:
+        str: Payload JSON enregistré ('null' si le livre était introuvable)
+             ou None si absent / expiré
+    
+    Exemple:
+        >>> get_api_cache('google_books', "9781234567890", 30 * 86400)
+        '{"title": "Mon livre", "author": "...", ...}'
+    """
+    min_fetched = int(time.time() - max_age) if max_age is not None else -1
+    result = fetch_one(_Q_GET_API_CACHE, (source, upc, min_fetched))
+    return result['payload'] if result else None
+
+
+def save_api_cache(source: str, upc: str, payload: str) -> bool:
+    """
+    Enregistre (ou remplace) une réponse API pour (source, upc).
+    
+    Args:
+        source: Nom de l'API ('google_books', 'openlibrary')
+        upc: Code UPC du livre
+        payload: Résultat analysé sérialisé en JSON ('null' = introuvable)
+    
+    Returns:
+        bool: True si succès
+    """
+    return execute_query(_Q_SAVE_API_CACHE, (source, upc, payload))
 
 
 # ========================================================================
@@ -886,13 +1746,43 @@ def update_qty_vendue(upc: str, quantity: int) -> bool:
     
     Returns:
         bool: True si succès
+    
+    Note:
+        La vente est répartie sur les scans de l'UPC du plus ancien au plus
+        récent (premier entré, premier vendu), sans dépasser la quantité de
+        chaque scan; un éventuel excédent va sur le scan le plus récent.
+        Seules les lignes qui changent sont réécrites (en général une seule),
+        au lieu de toutes les lignes de l'UPC.
     """
-    query = """
-    UPDATE scans 
-    SET qty_vendue = qty_vendue + ?
-    WHERE upc = ?
-    """
-    return execute_query(query, (quantity, upc))
+    try:
+        with write_tx() as conn:
+            rows = conn.execute(
+                "SELECT id, quantity, qty_vendue FROM scans WHERE upc = ? ORDER BY timestamp ASC",
+                (upc,)
+            ).fetchall()
+            
+            if not rows:
+                return True
+            
+            remaining = quantity
+            updates = []
+            for row in rows:
+                if remaining <= 0:
+                    break
+                available = max(0, (row['quantity'] or 0) - (row['qty_vendue'] or 0))
+                sold = min(available, remaining)
+                if sold > 0:
+                    updates.append((sold, row['id']))
+                    remaining -= sold
+            
+            if remaining > 0:
+                updates.append((remaining, rows[-1]['id']))
+            
+            conn.executemany(_Q_ADD_QTY_VENDUE, updates)
+        return True
+    except Exception as e:
+        print(f"❌ Erreur update_qty_vendue: {e}")
+        return False
 
 
 def get_total_revenue() -> float:
@@ -910,10 +1800,46 @@ def get_total_revenue() -> float:
     return 0.0
 
 
+def get_total_sold_quantity() -> int:
+    """Retourne le nombre total de livres vendus (somme des quantités)."""
+    query = "SELECT COALESCE(SUM(quantity), 0) as total FROM sales"
+    result = fetch_one(query)
+    
+    if result:
+        return result['total']
+    return 0
+
+
+def get_sales_totals() -> Dict[str, Any]:
+    """
+    Retourne les totaux des ventes en une seule requête.
+    
+    Returns:
+        dict: {'total_orders': int, 'total_items': int, 'total_revenue': float}
+    
+    Note:
+        Évite de charger toute la table sales (get_all_sales) juste
+        pour compter et additionner en Python.
+    """
+    query = """
+    SELECT
+        COUNT(*) as total_orders,
+        COALESCE(SUM(quantity), 0) as total_items,
+        COALESCE(SUM(sale_price * quantity), 0.0) as total_revenue
+    FROM sales
+    """
+    result = fetch_one(query)
+    
+    if result:
+        return result
+    return {'total_orders': 0, 'total_items': 0, 'total_revenue': 0.0}
+
+
 # ========================================================================
 # STATISTIQUES & DASHBOARD
 # ========================================================================
 
+@_cached_stat
 def get_total_scanned() -> int:
     """Retourne le nombre total de livres scannés (somme des quantités)."""
     query = "SELECT SUM(quantity) as total FROM scans"
@@ -924,41 +1850,95 @@ def get_total_scanned() -> int:
     return 0
 
 
+def _today_bounds() -> tuple:
+    """
+    Retourne les bornes ISO (aujourd'hui, demain) pour filtrer sur timestamp.
+    
+    Note:
+        "timestamp >= ? AND timestamp < ?" utilise idx_scans_ts,
+        contrairement à "DATE(timestamp) = ?" qui force un scan complet.
+    """
+    today = datetime.now().date()
+    return today.isoformat(), (today + timedelta(days=1)).isoformat()
+
+
 def get_scans_today() -> int:
     """Retourne le nombre de scans aujourd'hui."""
-    today = datetime.now().date().isoformat()
-    
     query = """
     SELECT SUM(quantity) as total 
     FROM scans 
-    WHERE DATE(timestamp) = ?
+    WHERE timestamp >= ? AND timestamp < ?
     """
-    result = fetch_one(query, (today,))
+    result = fetch_one(query, _today_bounds())
     
     if result and result['total']:
         return result['total']
     return 0
 
 
-def get_scans_by_condition() -> List[Dict]:
-    """Retourne le nombre de scans par condition."""
+def get_scans_by_condition() -> List[sqlite3.Row]:
+    """Retourne le nombre de scans par condition (row['condition'], row['count'])."""
     query = """
     SELECT condition, SUM(quantity) as count
     FROM scans
     GROUP BY condition
     ORDER BY count DESC
     """
-    return fetch_all(query)
+    return fetch_all_rows(query)
 
 
-def get_scans_by_status() -> List[Dict]:
-    """Retourne le nombre de scans par statut."""
+def get_scans_by_status() -> List[sqlite3.Row]:
+    """Retourne le nombre de scans par statut (row['status'], row['count'])."""
     query = """
     SELECT status, COUNT(*) as count
     FROM scans
     GROUP BY status
     """
-    return fetch_all(query)
+    return fetch_all_rows(query)
+
+
+def get_dashboard_scalars() -> Dict[str, Any]:
+    """
+    Retourne tous les compteurs du dashboard en UN SEUL aller-retour SQL.
+    
+    Remplace 7 requêtes séparées (une préparation + exécution chacune)
+    par un seul SELECT de sous-requêtes scalaires.
+    
+    Returns:
+        dict: {
+            'manifest_total': int,   # = count_manifest()
+            'total_scanned': int,    # = get_total_scanned()
+            'scans_today': int,      # = get_scans_today()
+            'enriched_count': int,   # = get_enriched_count()
+            'exported_count': int,   # = get_exported_count()
+            'total_sales': int,      # Somme des quantités vendues
+            'total_revenue': float   # = get_total_revenue()
+        }
+    
+    Note:
+        Les regroupements (par statut, par condition) restent des
+        requêtes séparées: voir get_scans_by_status/get_scans_by_condition.
+    """
+    query = """
+    SELECT
+        (SELECT COALESCE(SUM(quantity), 0) FROM manifest) as manifest_total,
+        (SELECT COALESCE(SUM(quantity), 0) FROM scans) as total_scanned,
+        (SELECT COALESCE(SUM(quantity), 0) FROM scans
+            WHERE timestamp >= ? AND timestamp < ?) as scans_today,
+        (SELECT COUNT(DISTINCT upc) FROM scans WHERE enriched = 1) as enriched_count,
+        (SELECT COUNT(*) FROM scans WHERE exported = 1) as exported_count,
+        (SELECT COALESCE(SUM(quantity), 0) FROM sales) as total_sales,
+        (SELECT COALESCE(SUM(sale_price * quantity), 0.0) FROM sales) as total_revenue
+    """
+    result = fetch_one(query, _today_bounds())
+    
+    if result:
+        return result
+    return {
+        'manifest_total': 0, 'total_scanned': 0, 'scans_today': 0,
+        'enriched_count': 0, 'exported_count': 0,
+        'total_sales': 0, 'total_revenue': 0.0
+    }
 
 
 # ========================================================================
@@ -970,6 +1950,20 @@ def get_scans_by_status() -> List[Dict]:
 # Ces fonctions sont des alias ou des wrappers pour assurer la 
 # compatibilité avec les autres modules (main_app.py, manifest_module.py, etc.)
 
+def update_scan_qty_vendue(upc: str, quantity: int) -> bool:
+    """
+    Alias pour update_qty_vendue() (compatibilité avec sales_import_module.py).
+    
+    Args:
+        upc: Code UPC du livre vendu
+        quantity: Nombre d'exemplaires vendus
+    
+    Returns:
+        bool: True si succès
+    """
+    return update_qty_vendue(upc, quantity)
+
+
 def get_manifest_by_upc(upc: str) -> Optional[Dict]:
     """
     Alias pour get_manifest_data() (compatibilité avec main_app.py).
@@ -991,6 +1985,7 @@ def get_manifest_by_upc(upc: str) -> Optional[Dict]:
     return get_manifest_data(upc)
 
 
+@_cached_stat
 def count_manifest() -> int:
     """Compte le nombre total de livres dans le MANIFEST (somme des quantités)."""
     query = "SELECT SUM(quantity) as total FROM manifest"
@@ -1001,6 +1996,7 @@ def count_manifest() -> int:
     return 0
 
 
+@_cached_stat
 def get_manifest_total_quantity() -> int:
     """
     Retourne la quantité totale de tous les livres du MANIFEST.
@@ -1041,9 +2037,17 @@ def get_manifest_progress() -> Dict[str, int]:
     
     Note:
         Utilisé par le Dashboard pour afficher la progression globale.
+        Les deux totaux sont lus en une seule requête.
+    """
+    query = """
+    SELECT
+        (SELECT COALESCE(SUM(quantity), 0) FROM manifest) as total_manifest,
+        (SELECT COALESCE(SUM(quantity), 0) FROM scans) as total_scanned
     """
-    total_manifest = get_manifest_total_quantity()
-    total_scanned = get_total_scanned()
+    result = fetch_one(query)
+    
+    total_manifest = result['total_manifest'] if result else 0
+    total_scanned = result['total_scanned'] if result else 0
     remaining = max(0, total_manifest - total_scanned)
     
     percent = 0.0
@@ -1058,6 +2062,51 @@ def get_manifest_progress() -> Dict[str, int]:
     }
 
 
+def get_progress_by_pallet(limit: Optional[int] = None) -> List[Dict]:
+    """
+    Retourne la progression par pallet, triée par quantité scannée (desc).
+    
+    Args:
+        limit: Nombre max de pallets (None = toutes)
+    
+    Returns:
+        list: [{'pallet': str, 'total_quantity': int, 'scanned_quantity': int}, ...]
+    
+    Exemple:
+        >>> get_progress_by_pallet(limit=3)
+        [{'pallet': '81343', 'total_quantity': 120, 'scanned_quantity': 45}, ...]
+    
+    Note:
+        Le tri et la limite sont faits par SQLite: Python ne reçoit
+        que les lignes demandées.
+    """
+    query = """
+    SELECT
+        m.pallet,
+        m.total_quantity,
+        COALESCE(s.scanned_quantity, 0) as scanned_quantity
+    FROM (
+        SELECT pallet, SUM(quantity) as total_quantity
+        FROM manifest
+        GROUP BY pallet
+    ) m
+    LEFT JOIN (
+        SELECT pallet, SUM(quantity) as scanned_quantity
+        FROM scans
+        GROUP BY pallet
+    ) s ON s.pallet = m.pallet
+    ORDER BY scanned_quantity DESC
+    LIMIT ?
+    """
+    # LIMIT -1 = pas de limite en SQLite
+    return fetch_all(query, (limit if limit is not None else -1,))
+
+
+def get_top_pallets_by_scanned(limit: int = 5) -> List[Dict]:
+    """Retourne les X pallets les plus avancées (voir get_progress_by_pallet)."""
+    return get_progress_by_pallet(limit=limit)
+
+
 def get_all_manifest_items() -> List[Dict]:
     """
     Retourne tous les items du MANIFEST.
@@ -1072,20 +2121,70 @@ def get_all_manifest_items() -> List[Dict]:
     return fetch_all(query)
 
 
+def iter_all_manifest_items() -> Iterator[sqlite3.Row]:
+    """
+    Itère sur tous les items du MANIFEST sans construire de liste.
+    
+    Yields:
+        sqlite3.Row: Un livre à la fois (même ordre que get_all_manifest_items)
+    
+    Exemple:
+        >>> for item in iter_all_manifest_items():
+        ...     print(item['upc'], item['title'])
+    
+    Note:
+        Mémoire constante même avec 14,000 livres. list(...) si une liste
+        est vraiment nécessaire.
+    """
+    return iter_rows("SELECT * FROM manifest ORDER BY pallet, upc")
+
+
+def _fts_query(search_term: str) -> str:
+    """
+    Convertit une saisie libre en requête FTS5: chaque mot devient un
+    préfixe entre guillemets ("harry"* "pott"*), tous requis.
+    """
+    words = re.findall(r"\w+", search_term or "")
+    return " ".join(f'"{w}"*' for w in words)
+
+
 def search_manifest(search_term: str) -> List[Dict]:
     """
     Recherche dans le MANIFEST par UPC ou titre.
     
+    Utilise l'index FTS5 manifest_fts (recherche par préfixe de mots,
+    triée par pertinence) au lieu d'un LIKE '%...%' qui lit toute la table.
+    
     Args:
-        search_term: Terme à rechercher (UPC ou partie du titre)
+        search_term: Terme à rechercher (début d'UPC ou mots du titre)
     
     Returns:
-        list: Liste des livres correspondants
+        list: Liste des livres correspondants (50 max)
     
     Exemple:
         >>> search_manifest("9781234")
         [{'upc': '9781234567890', 'title': '...', ...}]
+    
+    Note:
+        Sans FTS5 (table absente), retombe sur l'ancienne recherche LIKE.
+    """
+    match = _fts_query(search_term)
+    if not match:
+        return []
+    
+    query = """
+    SELECT m.* FROM manifest_fts f
+    JOIN manifest m ON m.id = f.rowid
+    WHERE manifest_fts MATCH ?
+    ORDER BY f.rank
+    LIMIT 50
     """
+    try:
+        with read_conn() as conn:
+            return [dict(row) for row in conn.execute(query, (match,))]
+    except sqlite3.OperationalError:
+        pass
+    
     query = """
     SELECT * FROM manifest 
     WHERE upc LIKE ? OR title LIKE ?
@@ -1112,7 +2211,7 @@ def test_database():
     init_database()
     print("✅ Tables créées")
     
-    # Test insert manifest
+    # Données de test
     test_manifest = {
         'pallet': 'TEST',
         'upc': '9999999999999',
@@ -1121,18 +2220,6 @@ def test_database():
         'title': 'Livre de test',
         'msrp': 19.99
     }
-    insert_manifest_item(test_manifest)
-    print("✅ Insert manifest OK")
-    
-    # Test check UPC
-    exists = check_upc_in_manifest('9999999999999')
-    print(f"✅ Check UPC: {exists}")
-    
-    # Test get manifest
-    data = get_manifest_data('9999999999999')
-    print(f"✅ Get manifest: {data['title'] if data else 'None'}")
-    
-    # Test insert scan
     test_scan = {
         'bin': 'C001',
         'upc': '9999999999999',
@@ -1141,12 +2228,25 @@ def test_database():
         'weight_minor': 500,
         'pkg_length': 20
     }
-    scan_id = insert_scan(test_scan)
+    dims = {'weight_minor': 500, 'pkg_length': 20}
+    
+    # Écritures groupées: une seule transaction (un commit)
+    with transaction():
+        insert_manifest_item(test_manifest)
+        scan_id = insert_scan(test_scan)
+        save_dimensions_for_upc('9999999999999', dims)
+    print("✅ Insert manifest OK")
     print(f"✅ Insert scan OK (ID: {scan_id})")
     
+    # Test check UPC
+    exists = check_upc_in_manifest('9999999999999')
+    print(f"✅ Check UPC: {exists}")
+    
+    # Test get manifest
+    data = get_manifest_data('9999999999999')
+    print(f"✅ Get manifest: {data['title'] if data else 'None'}")
+    
     # Test dimensions
-    dims = {'weight_minor': 500, 'pkg_length': 20}
-    save_dimensions_for_upc('9999999999999', dims)
     saved_dims = get_dimensions_for_upc('9999999999999')
     print(f"✅ Dimensions cache: {saved_dims['weight_minor'] if saved_dims else 'None'}")
     
@@ -1154,103 +2254,99 @@ def test_database():
 
 
 # ======================= ENRICHISSEMENT: UPDATE & GET BY ID =======================
+# Champs renvoyés par enrichment_module.enrich_book → colonnes de scans
+# (isbn, isbn13, category, api_source n'existent pas dans scans: ignorés)
+_ENRICHMENT_COLUMNS = (
+    ('title', 'title'),
+    ('author', 'author'),
+    ('publisher', 'publisher'),
+    ('publication_date', 'pub_year'),
+    ('language', 'language'),
+    ('pages', 'pages'),
+    ('description', 'description'),
+    ('image_url', 'image_url'),
+    ('retail_price', 'msrp'),
+)
+
+
 def update_scan_enrichment(scan_id: int, enrichment_data: dict) -> bool:
     """
-    Met à jour un scan avec les données d'enrichissement (APIs).
+    Met à jour un scan avec les données d'enrichissement (APIs)
+    et le marque enrichi (enriched = 1).
     
     Args:
         scan_id: ID du scan dans la table scans
         enrichment_data: Dictionnaire avec les données enrichies
         
     Returns:
-        True si succès, False sinon
+        True si succès, False sinon (erreur SQL ou scan introuvable)
     """
     try:
-        # Liste des champs à mettre à jour
+        # Champs non vides seulement (une valeur vide n'écrase pas l'existant)
         updates = []
         values = []
-        
-        # Mapping API → DB (champs les plus importants)
-        if enrichment_data.get('title'):
-            updates.append("title = ?")
-            values.append(enrichment_data['title'])
-        
-        if enrichment_data.get('author'):
-            updates.append("author = ?")
-            values.append(enrichment_data['author'])
-        
-        if enrichment_data.get('publisher'):
-            updates.append("publisher = ?")
-            values.append(enrichment_data['publisher'])
-        
-        if enrichment_data.get('publication_date'):
-            updates.append("publication_date = ?")
-            values.append(enrichment_data['publication_date'])
-        
-        if enrichment_data.get('isbn'):
-            updates.append("isbn = ?")
-            values.append(enrichment_data['isbn'])
-        
-        if enrichment_data.get('isbn13'):
-            updates.append("isbn13 = ?")
-            values.append(enrichment_data['isbn13'])
-        
-        if enrichment_data.get('language'):
-            updates.append("language = ?")
-            values.append(enrichment_data['language'])
-        
-        if enrichment_data.get('pages'):
-            updates.append("pages = ?")
-            values.append(enrichment_data['pages'])
-        
-        if enrichment_data.get('description'):
-            updates.append("description = ?")
-            values.append(enrichment_data['description'])
-        
-        if enrichment_data.get('category'):
-            updates.append("category = ?")
-            values.append(enrichment_data['category'])
-        
-        if enrichment_data.get('image_url'):
-            updates.append("image_url = ?")
-            values.append(enrichment_data['image_url'])
-        
-        if enrichment_data.get('retail_price'):
-            updates.append("msrp = ?")
-            values.append(enrichment_data['retail_price'])
-        
-        if enrichment_data.get('api_source'):
-            updates.append("api_source = ?")
-            values.append(enrichment_data['api_source'])
+        for field, column in _ENRICHMENT_COLUMNS:
+            value = enrichment_data.get(field)
+            if value:
+                updates.append(f"{column} = ?")
+                values.append(value)
         
         # Si aucune donnée à mettre à jour, retourner True quand même
         if not updates:
             print(f"⚠️  Aucune donnée à sauvegarder pour scan_id={scan_id}")
             return True
         
-        # Ajouter l'ID à la fin
+        query = f"""
+        UPDATE scans
+        SET {', '.join(updates)}, enriched = 1, enriched_date = {_SQL_NOW}
+        WHERE id = ?
+        """
         values.append(scan_id)
         
-        # Construire la requête SQL
-        query = f"UPDATE scans SET {', '.join(updates)} WHERE id = ?"
+        with write_tx() as conn:
+            updated = conn.execute(query, values).rowcount
         
-        # DEBUG: Afficher la requête
-        print(f"🔧 SQL UPDATE: {query}")
-        print(f"🔧 VALUES: {values}")
-        
-        # Exécuter
-        execute_query(query, tuple(values))
-        
-        print(f"✅ Scan {scan_id} mis à jour avec succès")
+        if not updated:
+            print(f"❌ Scan {scan_id} introuvable")
+            return False
         return True
         
     except Exception as e:
         print(f"❌ Erreur update_scan_enrichment (scan_id={scan_id}): {e}")
-        import traceback
-        traceback.print_exc()
         return False
 
 
+def update_scans_enrichment_many(updates: List[Tuple[int, dict]]) -> List[int]:
+    """
+    Applique update_scan_enrichment à plusieurs scans dans une seule
+    transaction (un seul commit au lieu d'un par scan).
+    
+    Args:
+        updates: Liste de (scan_id, enrichment_data)
+    
+    Returns:
+        list: IDs des scans mis à jour avec succès
+    
+    Exemple:
+        >>> update_scans_enrichment_many([(1, {'author': 'Coelho'}), (2, {...})])
+        [1, 2]
+    
+    Note:
+        Une erreur sur un scan n'annule pas les autres (même comportement
+        que des appels update_scan_enrichment successifs).
+    """
+    updated = []
+    try:
+        with transaction():
+            for scan_id, enrichment_data in updates:
+                if update_scan_enrichment(scan_id, enrichment_data):
+                    updated.append(scan_id)
+    except Exception as e:
+        print(f"❌ Erreur update_scans_enrichment_many: {e}")
+        return []
+    return updated
+
+
 def get_scan_by_id(scan_id: int) -> dict:
     """
     Récupère un scan par son ID.
@@ -1362,6 +2458,38 @@ def get_scans_today_quantity() -> int:
 
 
 
+@_cached_stat
+def get_dashboard_counts() -> Dict[str, int]:
+    """
+    Compte enrichis / non enrichis / exportés en une seule requête.
+    
+    Returns:
+        dict: {
+            'enriched': int,      # UPCs distincts avec enriched = 1
+            'not_enriched': int,  # UPCs distincts avec enriched = 0
+            'exported': int       # Scans avec exported = 1
+        }
+    
+    Note:
+        Chaque compteur lit un petit index (idx_scans_enriched_upc,
+        idx_scans_exported_only) au lieu de parcourir toute la table.
+        Mis en cache (voir _cached_stat): get_enriched_count(),
+        get_not_enriched_count() et get_exported_count() appelés à la
+        suite ne font qu'une seule requête.
+    """
+    query = """
+    SELECT
+        (SELECT COUNT(DISTINCT upc) FROM scans WHERE enriched = 1) as enriched,
+        (SELECT COUNT(DISTINCT upc) FROM scans WHERE enriched = 0) as not_enriched,
+        (SELECT COUNT(*) FROM scans WHERE exported = 1) as exported
+    """
+    result = fetch_one(query)
+    
+    if result:
+        return result
+    return {'enriched': 0, 'not_enriched': 0, 'exported': 0}
+
+
 def get_enriched_count() -> int:
     """
     Compte le nombre de scans enrichis (avec métadonnées des APIs).
@@ -1376,12 +2504,7 @@ def get_enriched_count() -> int:
     Note:
         Utilisé par le Dashboard pour afficher "X scans enrichis"
     """
-    query = "SELECT COUNT(DISTINCT upc) as count FROM scans WHERE enriched = 1"
-    result = fetch_one(query)
-    
-    if result:
-        return result['count']
-    return 0
+    return get_dashboard_counts()['enriched']
 
 
 def get_not_enriched_count() -> int:
@@ -1394,12 +2517,7 @@ def get_not_enriched_count() -> int:
     Note:
         Utilisé pour savoir combien de livres attendent l'enrichissement.
     """
-    query = "SELECT COUNT(DISTINCT upc) as count FROM scans WHERE enriched = 0"
-    result = fetch_one(query)
-    
-    if result:
-        return result['count']
-    return 0
+    return get_dashboard_counts()['not_enriched']
 
 
 
@@ -1417,9 +2535,4 @@ def get_exported_count() -> int:
     Note:
         Utilisé par le Dashboard pour afficher "X scans exportés"
     """
-    query = "SELECT COUNT(DISTINCT id) as count FROM scans WHERE exported = 1"
-    result = fetch_one(query)
-    
-    if result:
-        return result['count']
-    return 0
\ No newline at end of file
+    return get_dashboard_counts()['exported']
\ No newline at end of file
@@ -18,19 +18,14 @@ def export_to_ebay_csv(output_path: str, scans_data: list) -> dict:
                 'file_path': None
             }
 
-        # Générer les lignes CSV
-        rows = []
-        for item in scans_data:
-            # Par défaut, quantité = item['quantity'] ou 1
-            quantity = item.get('quantity', 1)
-            row = build_ebay_row(item, quantity)
-            rows.append(row)
-
-        # Écrire le fichier CSV
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        # Écrire le fichier CSV (lignes générées au fil de l'écriture)
+        # Par défaut, quantité = item['quantity'] ou 1
+        with open(output_path, 'w', newline='', encoding='utf-8',
+                  buffering=_CSV_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             writer.writerow(config.EBAY_CSV_HEADERS)
-            writer.writerows(rows)
+            writer.writerows(build_ebay_row(item, item.get('quantity', 1))
+                             for item in scans_data)
 
         print(f"✅ Export terminé: {output_path}")
         return {
@@ -53,6 +48,8 @@ Génère fichiers CSV au format eBay File Exchange (51 colonnes)
 """
 
 import csv
+import operator
+import os
 from datetime import datetime
 from pathlib import Path
 import config
@@ -63,6 +60,45 @@ import utils
 # CSV GENERATION
 # ========================================================================
 
+# Colonnes fixes (identiques pour toutes les lignes) - calculées une fois à l'import.
+# Toute colonne absente d'ici et de build_ebay_row() reste vide.
+_EBAY_CONSTANT_FIELDS = dict.fromkeys(config.EBAY_CSV_HEADERS, '')
+_EBAY_CONSTANT_FIELDS.update({
+    config.EBAY_CSV_HEADERS[0]: 'Add',          # *Action(SiteID=...|...)
+    'Format': config.EBAY_FORMAT,
+    'Duration': config.EBAY_DURATION,
+    'Location': config.EBAY_LOCATION,
+    'PostalCode': config.EBAY_POSTAL_CODE,
+})
+
+# Ligne modèle (51 colonnes, ordre des headers) avec les colonnes fixes déjà
+# en place: build_ebay_row() la copie et ne remplit que les colonnes variables
+_ROW_TEMPLATE = list(operator.itemgetter(*config.EBAY_CSV_HEADERS)(_EBAY_CONSTANT_FIELDS))
+
+# Position de chaque colonne variable dans la ligne
+_COL = {header: i for i, header in enumerate(config.EBAY_CSV_HEADERS)}
+(_I_SKU, _I_CATEGORY_ID, _I_TITLE, _I_START_PRICE, _I_QUANTITY, _I_PHOTO_URL,
+ _I_CONDITION_ID, _I_DESCRIPTION, _I_AUTHOR, _I_BOOK_TITLE, _I_LANGUAGE,
+ _I_FORMAT, _I_PUB_YEAR, _I_WEIGHT_MAJOR, _I_WEIGHT_MINOR, _I_PKG_LENGTH,
+ _I_PKG_DEPTH, _I_PKG_WIDTH) = (_COL[header] for header in (
+    'Custom label (SKU)', 'Category ID', 'Title', 'Start price', 'Quantity',
+    'Item photo URL', 'Condition ID', 'Description', 'C:Author', 'C:Book Title',
+    'C:Language', 'C:Format', 'C:Publication Year', 'WeightMajor', 'WeightMinor',
+    'PackageLength', 'PackageDepth', 'PackageWidth'))
+
+# Tampon d'écriture du CSV: 1 MiB au lieu de 8 KiB (beaucoup moins d'appels write())
+_CSV_BUFFER_SIZE = 1 << 20
+
+# Codes langue ISO → valeurs eBay
+_LANG_MAP = {
+    'eng': 'English',
+    'fra': 'French',
+    'fre': 'French',
+    'spa': 'Spanish',
+    'deu': 'German',
+    'ger': 'German'
+}
+
 def build_ebay_row(scan_data, aggregated_quantity):
     """
     Construit une ligne CSV eBay (51 colonnes) depuis données scan.
@@ -70,118 +106,20 @@ def build_ebay_row(scan_data, aggregated_quantity):
         scan_data (dict): Données d'un scan enrichi
         aggregated_quantity (int): Quantité agrégée (si plusieurs scans même UPC+Condition)
     Returns:
-        list: 51 valeurs
+        list: 51 valeurs, dans l'ordre de config.EBAY_CSV_HEADERS
     """
     
-    # Action (col 1)
-    action = 'Add'
-    
-    # Custom label / SKU (col 2) = UPC
-    sku = scan_data.get('upc', '')
-    
-    # Category ID (col 3)
-    category_id = scan_data.get('ebay_category', config.EBAY_CATEGORY_BOOKS)
-    
-    # Category name (col 4) - vide
-    category_name = ''
-    
-    # Title (col 5)
-    title = scan_data.get('title', 'Livre')
-    # Tronque si trop long (eBay max 80 caractères)
-    title = utils.truncate_text(title, 80, '...')
-    
-    # Relationship (col 6-7) - vide
-    relationship = ''
-    relationship_details = ''
-    
-    # Schedule Time (col 8) - vide
-    schedule_time = ''
-    
-    # P:EPID (col 9) - vide
-    epid = ''
-    
-    # Start price (col 10)
-    start_price = scan_data.get('start_price', config.MIN_PRICE)
-    
-    # Quantity (col 11) - agrégée
-    quantity = aggregated_quantity
-    
-    # Item photo URL (col 12)
-    photo_url = scan_data.get('image_url', '')
-    
-    # VideoID (col 13) - vide
-    video_id = ''
-    
-    # Condition ID (col 14)
-    condition_id = scan_data.get('ebay_condition_id', '5000')
-    
-    # Description (col 15) - HTML
-    description = scan_data.get('description_html', '')
-    
-    # Format (col 16)
-    format_type = config.EBAY_FORMAT
-    
-    # Duration (col 17)
-    duration = config.EBAY_DURATION
-    
-    # Buy It Now price (col 18) - vide
-    buy_it_now = ''
-    
-    # Best Offer (col 19-21) - vides
-    best_offer_enabled = ''
-    best_offer_auto_accept = ''
-    best_offer_min = ''
-    
-    # Immediate pay (col 22) - vide
-    immediate_pay = ''
-    
-    # Location (col 23)
-    location = config.EBAY_LOCATION
-    
-    # Shipping (col 24-35) - tous vides (utilise profil par défaut)
-    shipping_cols = [''] * 12
+    # Title - tronqué (eBay max 80 caractères)
+    title = utils.truncate_text(scan_data.get('title', 'Livre'), 80, '...')
     
-    # Profiles (col 36-38) - vides
-    shipping_profile = ''
-    return_profile = ''
-    payment_profile = ''
+    # C:Author
+    author = utils.truncate_text(scan_data.get('author', 'Auteur inconnu'), 50, '...')
     
-    # Compliance (col 39-40) - vides
-    compliance_policy = ''
-    regional_compliance = ''
-    
-    # Book specifics (col 41-44)
-    # C:Author (col 41)
-    author = scan_data.get('author', 'Auteur inconnu')
-    author = utils.truncate_text(author, 50, '...')
-    
-    # C:Book Title (col 42) - répète title
-    book_title = title
-    
-    # C:Language (col 43)
+    # C:Language
     language = scan_data.get('language', 'eng')
-    # Map ISO codes to eBay values
-    lang_map = {
-        'eng': 'English',
-        'fra': 'French',
-        'fre': 'French',
-        'spa': 'Spanish',
-        'deu': 'German',
-        'ger': 'German'
-    }
-    language_display = lang_map.get(language.lower(), 'English')
     
-    # C:Format (col 44)
-    binding = scan_data.get('binding', config.DEFAULT_BINDING)
-    
-    # C:Publication Year (col 45)
-    pub_year = scan_data.get('pub_year', '')
-    
-    # Package dimensions (col 46-51)
-    # WeightMajor (kg) (col 46)
+    # WeightMajor (kg) / WeightMinor (g)
     weight_major = scan_data.get('weight_major', 0)
-    
-    # WeightMinor (g) (col 47)
     weight_minor = scan_data.get('weight_minor', 0)
     
     # Si poids = 0, estime basé sur pages
@@ -190,75 +128,28 @@ def build_ebay_row(scan_data, aggregated_quantity):
         total_weight_g = utils.estimate_weight_from_pages(pages)
         weight_major, weight_minor = utils.weight_grams_to_major_minor(total_weight_g)
     
-    # WeightUnit (col 48) - vide (car major=kg, minor=g)
-    weight_unit = ''
-    
-    # PackageLength (cm) (col 49)
-    pkg_length = scan_data.get('pkg_length', 0)
-    
-    # PackageDepth (cm) (col 50)
-    pkg_depth = scan_data.get('pkg_depth', 0)
-    
-    # PackageWidth (cm) (col 51)
-    pkg_width = scan_data.get('pkg_width', 0)
-    
-    # PostalCode (col 52) - Oops, liste était 51 mais en a 52!
-    postal_code = config.EBAY_POSTAL_CODE
-    
-    # Construct row (52 colonnes au total - le template avait une erreur)
-    # Mais config.EBAY_CSV_HEADERS a bien 51, donc on garde 51
-    row = [
-        action,                    # 1
-        sku,                       # 2
-        category_id,               # 3
-        category_name,             # 4
-        title,                     # 5
-        relationship,              # 6
-        relationship_details,      # 7
-        schedule_time,             # 8
-        epid,                      # 9
-        start_price,               # 10
-        quantity,                  # 11
-        photo_url,                 # 12
-        video_id,                  # 13
-        condition_id,              # 14
-        description,               # 15
-        format_type,               # 16
-        duration,                  # 17
-        buy_it_now,                # 18
-        best_offer_enabled,        # 19
-        best_offer_auto_accept,    # 20
-        best_offer_min,            # 21
-        immediate_pay,             # 22
-        location,                  # 23
-        *shipping_cols,            # 24-35 (12 colonnes)
-        shipping_profile,          # 36
-        return_profile,            # 37
-        payment_profile,           # 38
-        compliance_policy,         # 39
-        regional_compliance,       # 40
-        author,                    # 41
-        book_title,                # 42
-        language_display,          # 43
-        binding,                   # 44
-        pub_year,                  # 45
-        weight_major,              # 46
-        weight_minor,              # 47
-        weight_unit,               # 48
-        pkg_length,                # 49
-        pkg_depth,                 # 50
-        pkg_width,                 # 51
-        postal_code                # 52 - mais on le garde car pratique
-    ]
-    
-    # En fait, config.EBAY_CSV_HEADERS a 51 colonnes incluant PostalCode
-    # Donc row devrait avoir 51 éléments. On enlève postal_code et on le met dans width
-    # Non, en fait, après vérification, le header a bien PostalCode en dernier (51)
-    # Donc row est correcte avec 52 éléments mais headers n'en a que 51
-    # Je dois ajuster: soit j'enlève postal_code du row, soit j'ajoute au header
-    # Je vais garder postal_code dans row (position 51) car c'est dans le template
-    
-    return row[:51]  # Garde seulement 51 premiers (enlève postal_code si déborde)
+    # Colonnes variables (WeightUnit reste vide car major=kg, minor=g)
+    row = _ROW_TEMPLATE.copy()
+    row[_I_SKU] = scan_data.get('upc', '')
+    row[_I_CATEGORY_ID] = scan_data.get('ebay_category', config.EBAY_CATEGORY_BOOKS)
+    row[_I_TITLE] = title
+    row[_I_START_PRICE] = scan_data.get('start_price', config.MIN_PRICE)
+    row[_I_QUANTITY] = aggregated_quantity
+    row[_I_PHOTO_URL] = scan_data.get('image_url', '')
+    row[_I_CONDITION_ID] = scan_data.get('ebay_condition_id', '5000')
+    row[_I_DESCRIPTION] = scan_data.get('description_html', '')
+    row[_I_AUTHOR] = author
+    row[_I_BOOK_TITLE] = title
+    row[_I_LANGUAGE] = _LANG_MAP.get(language.lower(), 'English')
+    row[_I_FORMAT] = scan_data.get('binding', config.DEFAULT_BINDING)
+    row[_I_PUB_YEAR] = scan_data.get('pub_year', '')
+    row[_I_WEIGHT_MAJOR] = weight_major
+    row[_I_WEIGHT_MINOR] = weight_minor
+    row[_I_PKG_LENGTH] = scan_data.get('pkg_length', 0)
+    row[_I_PKG_DEPTH] = scan_data.get('pkg_depth', 0)
+    row[_I_PKG_WIDTH] = scan_data.get('pkg_width', 0)
+    
+    return row
 
 def aggregate_scans_by_upc_condition(scans):
     """
@@ -269,19 +160,19 @@ def aggregate_scans_by_upc_condition(scans):
     aggregated = {}
     
     for scan in scans:
-        upc = scan['upc']
-        condition = scan['condition']
-        key = f"{upc}_{condition}"
+        # Clé tuple (pas de chaîne formatée), une seule recherche par scan
+        key = (scan['upc'], scan['condition'])
+        entry = aggregated.get(key)
         
-        if key not in aggregated:
-            aggregated[key] = {
+        if entry is None:
+            entry = aggregated[key] = {
                 'scan_data': scan,
                 'quantity': 0,
                 'scan_ids': []
             }
         
-        aggregated[key]['quantity'] += scan['quantity']
-        aggregated[key]['scan_ids'].append(scan['id'])
+        entry['quantity'] += scan['quantity']
+        entry['scan_ids'].append(scan['id'])
     
     return list(aggregated.values())
 
@@ -325,7 +216,7 @@ def generate_ebay_csv(output_path, date_filter=None, mark_exported=True):
     print(f"   Scans trouvés: {len(scans)}")
     
     # Skip donations
-    scans = [s for s in scans if s['condition'].upper() != 'DONATION']
+    scans = [s for s in scans if s['condition'] != 'DONATION']
     print(f"   Après filtrage donations: {len(scans)}")
     
     if not scans:
@@ -340,50 +231,56 @@ def generate_ebay_csv(output_path, date_filter=None, mark_exported=True):
     aggregated = aggregate_scans_by_upc_condition(scans)
     print(f"   Lignes agrégées: {len(aggregated)}")
     
-    # Build rows
-    rows = []
+    # Build rows: générées pendant l'écriture, pas de liste intermédiaire
     scan_ids_to_mark = []
+    row_count = 0
     
-    for item in aggregated:
-        scan_data = item['scan_data']
-        quantity = item['quantity']
-        
-        # Check minimum price
-        if config.EXPORT_MIN_PRICE_CHECK:
-            price = scan_data.get('start_price', 0)
-            if price < config.MIN_PRICE:
-                print(f"   ⚠️ Skip UPC {scan_data['upc']}: prix ${price} < ${config.MIN_PRICE}")
-                continue
-        
-        # Build row
-        row = build_ebay_row(scan_data, quantity)
-        rows.append(row)
-        
-        # Collect scan IDs to mark
-        scan_ids_to_mark.extend(item['scan_ids'])
-    
-    if not rows:
-        return {
-            'success': False,
-            'row_count': 0,
-            'message': 'Aucune ligne valide après filtrage prix minimum',
-            'file_path': None
-        }
-    
-    print(f"   Lignes finales: {len(rows)}")
+    def _row_iter():
+        nonlocal row_count
+        for item in aggregated:
+            scan_data = item['scan_data']
+            
+            # Check minimum price
+            if config.EXPORT_MIN_PRICE_CHECK:
+                price = scan_data.get('start_price', 0)
+                if price < config.MIN_PRICE:
+                    print(f"   ⚠️ Skip UPC {scan_data['upc']}: prix ${price} < ${config.MIN_PRICE}")
+                    continue
+            
+            # Collect scan IDs to mark
+            scan_ids_to_mark.extend(item['scan_ids'])
+            row_count += 1
+            
+            yield build_ebay_row(scan_data, item['quantity'])
     
-    # Write CSV
+    # Write CSV: dans un fichier temporaire du même dossier, renommé à la fin,
+    # pour ne jamais écraser un CSV existant par un export vide ou interrompu
+    tmp_path = f"{output_path}.tmp"
     try:
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        with open(tmp_path, 'w', newline='', encoding='utf-8',
+                  buffering=_CSV_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             
             # Headers
             writer.writerow(config.EBAY_CSV_HEADERS)
             
             # Rows
-            writer.writerows(rows)
+            writer.writerows(_row_iter())
+        
+        if not row_count:
+            # Seulement les en-têtes: on laisse output_path tel quel
+            Path(tmp_path).unlink(missing_ok=True)
+            return {
+                'success': False,
+                'row_count': 0,
+                'message': 'Aucune ligne valide après filtrage prix minimum',
+                'file_path': None
+            }
+        
+        os.replace(tmp_path, output_path)
         
-        print(f"   ✅ CSV généré: {len(rows)} lignes")
+        print(f"   Lignes finales: {row_count}")
+        print(f"   ✅ CSV généré: {row_count} lignes")
         
         # Mark as exported
         if mark_exported and scan_ids_to_mark:
@@ -394,12 +291,13 @@ def generate_ebay_csv(output_path, date_filter=None, mark_exported=True):
         
         return {
             'success': True,
-            'row_count': len(rows),
-            'message': f'{len(rows)} listing(s) exporté(s)',
+            'row_count': row_count,
+            'message': f'{row_count} listing(s) exporté(s)',
             'file_path': output_path
         }
     
     except Exception as e:
+        Path(tmp_path).unlink(missing_ok=True)
         print(f"   ❌ Erreur écriture CSV: {e}")
         print("=" * 60)
         
@@ -462,7 +360,7 @@ def preview_export(limit=10):
     scans = database.get_unexported_scans()
     
     # Skip donations
-    scans = [s for s in scans if s['condition'].upper() != 'DONATION']
+    scans = [s for s in scans if s['condition'] != 'DONATION']
     
     # Aggregate
     aggregated = aggregate_scans_by_upc_condition(scans)
@@ -498,7 +396,7 @@ def validate_export_ready():
         }
     
     # Skip donations
-    scans = [s for s in scans if s['condition'].upper() != 'DONATION']
+    scans = [s for s in scans if s['condition'] != 'DONATION']
     
     if not scans:
         return {
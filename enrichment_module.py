@@ -3,13 +3,145 @@ Module Enrichissement - Scanner Livre App
 Enrichit les livres scannés avec Google Books API et OpenLibrary API
 """
 
+import json
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import config
 import utils
 import database
 
+try:
+    import orjson  # optionnel: décodeur JSON en C, plusieurs fois plus rapide
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data):
+    """Décode du JSON (bytes ou str) avec orjson si installé, sinon json."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# ========================================================================
+# SESSION HTTP & LIMITE DE DÉBIT
+# ========================================================================
+
+def _make_session():
+    """
+    Crée la session HTTP partagée: connexions TCP/TLS réutilisées
+    (keep-alive) et retries automatiques.
+    
+    Seuls les échecs temporaires (timeout, connexion, 429, 5xx) sont
+    réessayés, avec attente exponentielle (API_RETRY_DELAY × 2^n) + aléa.
+    Un 404 / livre introuvable répond tout de suite, sans attente.
+    """
+    retry_options = dict(
+        total=config.API_MAX_RETRIES,
+        backoff_factor=config.API_RETRY_DELAY,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False  # après les retries: on garde la réponse (status != 200 → None)
+    )
+    try:
+        # Aléa sur l'attente (urllib3 >= 2): les threads ne réessaient pas tous en même temps
+        retry = Retry(**retry_options, backoff_jitter=config.API_RETRY_JITTER)
+    except TypeError:
+        retry = Retry(**retry_options)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.API_POOL_SIZE,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    # Identifie l'application (OpenLibrary le demande) et réponses compressées
+    session.headers.update({
+        'User-Agent': config.API_USER_AGENT,
+        'Accept-Encoding': 'gzip, deflate',
+    })
+    return session
+
+
+_SESSION = _make_session()
+
+# (connexion, lecture): un hôte injoignable échoue vite au lieu de bloquer
+# un thread pendant tout le délai de lecture
+_GB_TIMEOUT = (config.API_CONNECT_TIMEOUT, config.GOOGLE_BOOKS_TIMEOUT)
+_OL_TIMEOUT = (config.API_CONNECT_TIMEOUT, config.OPENLIBRARY_TIMEOUT)
+
+
+class _RateLimiter:
+    """
+    Espace les requêtes vers un même hôte d'au moins `interval` secondes,
+    même quand plusieurs threads appellent l'API en même temps.
+    """
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+    
+    def wait(self):
+        if self.interval <= 0:
+            return  # Pas de limite
+        # Réserve le prochain créneau sous le verrou, attend en dehors
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Sans config.API_THROTTLE: aucune attente (comportement d'origine)
+_GOOGLE_LIMITER = _RateLimiter(config.GOOGLE_BOOKS_RATE_LIMIT if config.API_THROTTLE else 0)
+_OPENLIBRARY_LIMITER = _RateLimiter(config.OPENLIBRARY_RATE_LIMIT if config.API_THROTTLE else 0)
+
+# Appels OpenLibrary lancés pendant que Google Books répond (hôtes différents)
+_API_EXECUTOR = ThreadPoolExecutor(max_workers=config.API_MAX_WORKERS,
+                                   thread_name_prefix='openlibrary')
+
+# Livres déjà enrichis avec succès pendant cette session: {upc: result}
+_RESULT_CACHE = {}
+
+
+def clear_enrich_cache():
+    """Vide le cache des livres enrichis (force de nouveaux appels API)."""
+    _RESULT_CACHE.clear()
+
+# ========================================================================
+# CACHE DES RÉPONSES (table api_cache)
+# ========================================================================
+
+def _cache_get(source, upc):
+    """
+    Cherche une réponse déjà obtenue pour (source, upc).
+    Returns: (trouvé, données) - données None si le livre était introuvable
+    """
+    if config.API_CACHE_REFRESH:
+        return False, None
+    
+    payload = database.get_api_cache(source, upc, config.API_CACHE_TTL)
+    if payload is None:
+        return False, None
+    return True, _json_loads(payload)
+
+def _cache_stale(source, upc):
+    """
+    Réponse en cache même expirée, utilisée quand l'API est en erreur
+    (timeout, 429/5xx après retries). Returns: dict ou None
+    """
+    payload = database.get_api_cache(source, upc, None)
+    return _json_loads(payload) if payload is not None else None
+
+def _cache_put(source, upc, data):
+    """
+    Enregistre le résultat analysé (None = introuvable, aussi mis en cache).
+    """
+    database.save_api_cache(source, upc, json.dumps(data, ensure_ascii=False))
+
 # ========================================================================
 # GOOGLE BOOKS API
 # ========================================================================
@@ -20,26 +152,37 @@ def fetch_google_books(upc):
     Args: upc (str)
     Returns: dict ou None
     """
+    found, cached = _cache_get('google_books', upc)
+    if found:
+        return cached
+    
     url = f"{config.GOOGLE_BOOKS_API}?q=isbn:{upc}"
     
     try:
-        response = requests.get(url, timeout=config.GOOGLE_BOOKS_TIMEOUT)
+        _GOOGLE_LIMITER.wait()
+        response = _SESSION.get(url, timeout=_GB_TIMEOUT)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             
+            result = None
             if data.get('totalItems', 0) > 0:
-                return parse_google_books_response(data)
+                result = parse_google_books_response(data)
+            
+            # Réponse valide (trouvé ou non): pas de nouvel appel au prochain passage
+            _cache_put('google_books', upc, result)
+            return result
         
-        return None
+        # API en erreur: ancienne réponse plutôt que rien
+        return _cache_stale('google_books', upc)
     
     except requests.exceptions.Timeout:
         print(f"⚠️ Google Books timeout pour UPC {upc}")
-        return None
+        return _cache_stale('google_books', upc)
     
     except Exception as e:
         print(f"❌ Erreur Google Books pour UPC {upc}: {e}")
-        return None
+        return _cache_stale('google_books', upc)
 
 def parse_google_books_response(data):
     """
@@ -109,6 +252,10 @@ def fetch_openlibrary(upc):
     Args: upc (str)
     Returns: dict ou None
     """
+    found, cached = _cache_get('openlibrary', upc)
+    if found:
+        return cached
+    
     # Essaie ISBN-13
     bibkeys = [f"ISBN:{upc}"]
     
@@ -120,25 +267,100 @@ def fetch_openlibrary(upc):
     url = f"{config.OPENLIBRARY_API}?bibkeys={','.join(bibkeys)}&format=json&jscmd=data"
     
     try:
-        response = requests.get(url, timeout=config.OPENLIBRARY_TIMEOUT)
+        _OPENLIBRARY_LIMITER.wait()
+        response = _SESSION.get(url, timeout=_OL_TIMEOUT)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             
             # Trouve première clé valide
+            result = None
             for bibkey in bibkeys:
                 if bibkey in data:
-                    return parse_openlibrary_response(data[bibkey], upc)
+                    result = parse_openlibrary_response(data[bibkey], upc)
+                    break
+            
+            _cache_put('openlibrary', upc, result)
+            return result
         
-        return None
+        # API en erreur: ancienne réponse plutôt que rien
+        return _cache_stale('openlibrary', upc)
     
     except requests.exceptions.Timeout:
         print(f"⚠️ OpenLibrary timeout pour UPC {upc}")
-        return None
+        return _cache_stale('openlibrary', upc)
     
     except Exception as e:
         print(f"❌ Erreur OpenLibrary pour UPC {upc}: {e}")
-        return None
+        return _cache_stale('openlibrary', upc)
+
+def fetch_openlibrary_batch(upcs):
+    """
+    Appelle OpenLibrary pour plusieurs ISBN à la fois (bibkeys= séparés par
+    des virgules, config.OPENLIBRARY_BATCH_SIZE UPCs par requête).
+    Les lots partent en parallèle, le débit reste limité par _RateLimiter.
+    
+    Args: upcs (list of str)
+    Returns:
+        dict: {upc: dict ou None} - None = introuvable. Un UPC absent du dict
+        n'a pas eu de réponse (lot en erreur): utiliser fetch_openlibrary.
+    """
+    results = {}
+    pending = []
+    for upc in dict.fromkeys(upcs):
+        found, cached = _cache_get('openlibrary', upc)
+        if found:
+            results[upc] = cached
+        else:
+            pending.append(upc)
+    
+    size = config.OPENLIBRARY_BATCH_SIZE
+    chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+    for batch in _API_EXECUTOR.map(_fetch_openlibrary_chunk, chunks):
+        results.update(batch)
+    
+    return results
+
+def _fetch_openlibrary_chunk(upcs):
+    """
+    Une requête OpenLibrary pour un lot d'UPCs (ISBN-13 + ISBN-10).
+    Returns: dict {upc: dict ou None}, vide si la requête a échoué
+    """
+    keys_by_upc = {}
+    for upc in upcs:
+        keys = [f"ISBN:{upc}"]
+        isbn10 = utils.isbn13_to_isbn10(upc)
+        if isbn10:
+            keys.append(f"ISBN:{isbn10}")
+        keys_by_upc[upc] = keys
+    
+    bibkeys = ','.join(key for keys in keys_by_upc.values() for key in keys)
+    url = f"{config.OPENLIBRARY_API}?bibkeys={bibkeys}&format=json&jscmd=data"
+    
+    try:
+        _OPENLIBRARY_LIMITER.wait()
+        response = _SESSION.get(url, timeout=_OL_TIMEOUT)
+        
+        if response.status_code != 200:
+            return {}
+        
+        data = _json_loads(response.content)
+    
+    except Exception as e:
+        print(f"❌ Erreur OpenLibrary (lot de {len(upcs)} UPCs): {e}")
+        return {}
+    
+    results = {}
+    for upc, keys in keys_by_upc.items():
+        result = None
+        for bibkey in keys:
+            if bibkey in data:
+                result = parse_openlibrary_response(data[bibkey], upc)
+                break
+        _cache_put('openlibrary', upc, result)
+        results[upc] = result
+    
+    return results
 
 def parse_openlibrary_response(data, upc):
     """
@@ -201,6 +423,21 @@ def parse_openlibrary_response(data, upc):
 # MERGE & ENRICH
 # ========================================================================
 
+# (champ, sources par priorité, valeur par défaut)
+# GB préféré: descriptions plus complètes, images de meilleure qualité.
+# Titre: MANIFEST d'abord (source officielle). Langue: OpenLibrary ne la fournit pas.
+_MANIFEST, _GB, _OL = 0, 1, 2
+_MERGE_SPEC = (
+    ('title', (_MANIFEST, _GB, _OL), 'Titre inconnu'),
+    ('author', (_GB, _OL), 'Auteur inconnu'),
+    ('publisher', (_GB, _OL), ''),
+    ('pub_year', (_GB, _OL), ''),
+    ('pages', (_GB, _OL), config.DEFAULT_PAGES),
+    ('description', (_GB, _OL), 'Description non disponible.'),
+    ('image_url', (_GB, _OL), ''),
+    ('language', (_GB,), config.DEFAULT_LANGUAGE),
+)
+
 def merge_book_data(gb_data, ol_data, manifest_data, scan_data):
     """
     Fusionne données de Google Books, OpenLibrary, MANIFEST et scan.
@@ -208,66 +445,39 @@ def merge_book_data(gb_data, ol_data, manifest_data, scan_data):
     Args: gb_data (dict), ol_data (dict), manifest_data (dict), scan_data (dict)
     Returns: dict complet
     """
+    # Sources absentes → dict vide: un seul test ici au lieu d'un par champ
+    manifest = manifest_data or {}
+    by_source = (manifest, gb_data or {}, ol_data or {})
+    
     merged = {}
     
     # UPC
     merged['upc'] = scan_data.get('upc')
     
-    # Title (MANIFEST prioritaire car c'est la source officielle)
-    merged['title'] = (manifest_data.get('title') or 
-                       (gb_data.get('title') if gb_data else None) or
-                       (ol_data.get('title') if ol_data else None) or
-                       'Titre inconnu')
-    
-    # Author
-    merged['author'] = ((gb_data.get('author') if gb_data else None) or
-                        (ol_data.get('author') if ol_data else None) or
-                        'Auteur inconnu')
-    
-    # Publisher
-    merged['publisher'] = ((gb_data.get('publisher') if gb_data else None) or
-                           (ol_data.get('publisher') if ol_data else None) or
-                           '')
-    
-    # Publication year
-    merged['pub_year'] = ((gb_data.get('pub_year') if gb_data else None) or
-                          (ol_data.get('pub_year') if ol_data else None) or
-                          '')
-    
-    # Pages
-    merged['pages'] = ((gb_data.get('pages') if gb_data else None) or
-                       (ol_data.get('pages') if ol_data else None) or
-                       config.DEFAULT_PAGES)
+    # Title, author, publisher, année, pages, description, image, language
+    for field, order, default in _MERGE_SPEC:
+        value = None
+        for source in order:
+            value = by_source[source].get(field)
+            if value:
+                break
+        merged[field] = value or default
     
     # Binding (Google Books plus fiable)
     merged['binding'] = config.DEFAULT_BINDING
     
-    # Language
-    merged['language'] = ((gb_data.get('language') if gb_data else None) or
-                          config.DEFAULT_LANGUAGE)
-    
-    # Description (préfère GB car souvent plus complète)
-    merged['description'] = ((gb_data.get('description') if gb_data else None) or
-                             (ol_data.get('description') if ol_data else None) or
-                             'Description non disponible.')
-    
-    # Image (préfère GB car meilleure qualité)
-    merged['image_url'] = ((gb_data.get('image_url') if gb_data else None) or
-                           (ol_data.get('image_url') if ol_data else None) or
-                           '')
-    
     # Condition (depuis scan)
     merged['condition'] = scan_data.get('condition')
     
     # MSRP (depuis MANIFEST)
-    merged['msrp'] = manifest_data.get('msrp', 0)
+    merged['msrp'] = manifest.get('msrp', 0)
     
     # Calculate price
     merged['start_price'] = utils.calculate_price(merged['msrp'], merged['condition'])
     
     # eBay specifics
     merged['ebay_category'] = config.EBAY_CATEGORY_BOOKS
-    merged['ebay_condition_id'] = config.get_condition_info(merged['condition'])['id']
+    merged['ebay_condition_id'] = config.get_condition_id(merged['condition'])
     
     # Generate HTML description
     merged['description_html'] = utils.generate_ebay_description(merged)
@@ -282,43 +492,85 @@ def merge_book_data(gb_data, ol_data, manifest_data, scan_data):
     
     return merged
 
-def enrich_book(upc, progress_callback=None):
+# Résultat vide d'enrich_book: copié à chaque appel (plus rapide que le
+# littéral de 14 clés)
+_RESULT_TEMPLATE = {
+    'success': False,
+    'title': None,
+    'author': None,
+    'publisher': None,
+    'publication_date': None,
+    'isbn': None,
+    'isbn13': None,
+    'language': None,
+    'pages': None,
+    'description': None,
+    'category': None,
+    'image_url': None,
+    'retail_price': None,
+    'api_source': None
+}
+
+# Champs qu'OpenLibrary peut compléter: tous remplis par Google Books → pas d'appel
+# (clé Google Books → clé du résultat d'enrich_book)
+_OPENLIBRARY_FIELDS = {
+    'title': 'title',
+    'author': 'author',
+    'publisher': 'publisher',
+    'pub_year': 'publication_date',
+    'pages': 'pages',
+    'description': 'description',
+    'image_url': 'image_url',
+}
+
+# Valeur par défaut de google_data (enrich_book): None signifie "introuvable"
+_FETCH = object()
+
+def _needs_openlibrary(google_data):
+    """True si OpenLibrary doit être interrogé après la réponse Google Books."""
+    if config.ENRICH_ALWAYS_MERGE_OL or not google_data:
+        return True
+    return not all(google_data.get(field) for field in _OPENLIBRARY_FIELDS)
+
+def enrich_book(upc, progress_callback=None, openlibrary_data=None, google_data=_FETCH):
     """
     Enrichit un livre à partir de son UPC.
     
     Args:
         upc (str): Code UPC du livre
         progress_callback (callable, optional): Fonction pour logs (message)
+        openlibrary_data (dict, optional): Réponse OpenLibrary déjà obtenue
+            (fetch_openlibrary_batch); None → appel OpenLibrary individuel
+        google_data (dict, optional): Réponse Google Books déjà obtenue
+            (None = introuvable); absent → appel Google Books
     Returns:
         dict avec tous les champs enrichis (title, author, publisher, etc.) 
         et un champ 'success' = True/False
     """
-    # Structure de base avec tous les champs
-    result = {
-        'success': False,
-        'title': None,
-        'author': None,
-        'publisher': None,
-        'publication_date': None,
-        'isbn': None,
-        'isbn13': None,
-        'language': None,
-        'pages': None,
-        'description': None,
-        'category': None,
-        'image_url': None,
-        'retail_price': None,
-        'api_source': None
-    }
+    # Structure de base avec tous les champs (copie du modèle)
+    result = _RESULT_TEMPLATE.copy()
+    
+    # Déjà enrichi pendant cette session: copie, pas de nouvel appel
+    cached = _RESULT_CACHE.get(upc)
+    if cached is not None:
+        return dict(cached)
     
     if progress_callback:
         progress_callback(f"🔍 Recherche UPC: {upc}")
     
     try:
-        # 1. Essayer Google Books API
-        if progress_callback:
-            progress_callback("  → Tentative Google Books API...")
-        google_data = fetch_google_books(upc)
+        # Avec ENRICH_ALWAYS_MERGE_OL, OpenLibrary démarre tout de suite, en
+        # parallèle de Google Books (latence = max des deux appels). Sinon il
+        # n'est appelé qu'après, si Google Books laisse des champs vides.
+        openlibrary_future = None
+        if google_data is _FETCH:
+            if openlibrary_data is None and config.ENRICH_ALWAYS_MERGE_OL:
+                openlibrary_future = _API_EXECUTOR.submit(fetch_openlibrary, upc)
+            
+            # 1. Essayer Google Books API
+            if progress_callback:
+                progress_callback("  → Tentative Google Books API...")
+            google_data = fetch_google_books(upc)
         
         if google_data:
             if progress_callback:
@@ -335,9 +587,15 @@ def enrich_book(upc, progress_callback=None):
             result['api_source'] = 'GoogleBooks'
         
         # 2. Essayer OpenLibrary API (fallback ou complément)
-        if progress_callback:
-            progress_callback("  → Tentative OpenLibrary API...")
-        openlibrary_data = fetch_openlibrary(upc)
+        complete = all(result[field] for field in _OPENLIBRARY_FIELDS.values())
+        if openlibrary_future is not None:
+            if progress_callback:
+                progress_callback("  → Tentative OpenLibrary API...")
+            openlibrary_data = openlibrary_future.result()
+        elif openlibrary_data is None and not complete:
+            if progress_callback:
+                progress_callback("  → Tentative OpenLibrary API...")
+            openlibrary_data = fetch_openlibrary(upc)
         
         if openlibrary_data:
             if progress_callback:
@@ -368,6 +626,9 @@ def enrich_book(upc, progress_callback=None):
         if not result['success']:
             if progress_callback:
                 progress_callback("  ❌ Non trouvé dans les APIs")
+        else:
+            # Échecs non mémorisés: l'API peut répondre au prochain essai
+            _RESULT_CACHE[upc] = dict(result)
         
         return result
         
@@ -383,7 +644,11 @@ def enrich_book(upc, progress_callback=None):
 
 def enrich_books(upc_list, progress_callback=None):
     """
-    Enrichit une liste d'UPCs.
+    Enrichit une liste d'UPCs, en trois temps:
+    1. Google Books en parallèle (config.API_MAX_WORKERS threads)
+    2. OpenLibrary par lots (fetch_openlibrary_batch), seulement pour les
+       livres que Google Books laisse incomplets
+    3. Fusion des réponses livre par livre (enrich_book)
     Args:
         upc_list (list of str)
         progress_callback (callable): fonction(current, total, message)
@@ -391,44 +656,80 @@ def enrich_books(upc_list, progress_callback=None):
         dict: {
             'success': int,
             'failed': int,
-            'results': [dict, ...]
+            'results': [dict, ...]  # même ordre que upc_list
         }
     """
-    results = []
     total = len(upc_list)
+    results = [None] * total
     success_count = 0
     failed_count = 0
     
     print(f"\n🔍 Enrichissement de {total} livre(s)...")
     print("=" * 60)
     
+    # Détail des sous-étapes par livre seulement en LOG_LEVEL DEBUG: sinon
+    # aucun message n'est formaté ni imprimé (une ligne par livre suffit)
+    verbose = config.LOG_LEVEL == "DEBUG"
+    
+    def enrich_one(upc):
+        item_progress = None
+        if verbose:
+            # Callback pour les sous-étapes (préfixé: les threads s'entremêlent)
+            def item_progress(message):
+                print(f"  [{upc}] {message}")
+                # Ne pas appeler progress_callback ici pour éviter spam
+        # Introuvable ou lot en erreur → enrich_book refait l'appel individuel
+        return enrich_book(upc, progress_callback=item_progress,
+                           openlibrary_data=openlibrary_batch.get(upc),
+                           google_data=google_batch.get(upc, _FETCH))
+    
+    # UPCs en double: un seul enrichissement, résultat recopié à chaque position
+    positions = {}
     for i, upc in enumerate(upc_list):
-        current = i + 1
-        # Progress callback principal
-        if progress_callback:
-            progress_callback(current, total, f"Livre {current}/{total}: {upc}")
-        # Log
-        print(f"\n[{current}/{total}] UPC: {upc}")
-        # Callback pour les sous-étapes
-        def item_progress(message):
-            print(f"  {message}")
-            # Ne pas appeler progress_callback ici pour éviter spam
-        # Enrichir avec progress_callback
-        result = enrich_book(upc, progress_callback=item_progress)
-        
-        # Stocker résultat (result contient déjà tous les champs + success)
-        results.append({
-            'upc': upc,
-            'success': result.get('success', False),
-            'message': 'Enrichi' if result.get('success') else 'Échec',
-            'data': result  # Le dict complet avec tous les champs
-        })
-        
-        # Compter
-        if result.get('success'):
-            success_count += 1
-        else:
-            failed_count += 1
+        positions.setdefault(upc, []).append(i)
+    
+    # Déjà enrichis pendant cette session: aucun appel API
+    pending = [upc for upc in positions if upc not in _RESULT_CACHE]
+    
+    current = 0
+    with ThreadPoolExecutor(max_workers=config.API_MAX_WORKERS) as executor:
+        # 1. Google Books pour tous les livres
+        google_batch = dict(zip(pending, executor.map(fetch_google_books, pending)))
+        
+        # 2. OpenLibrary par lots (~50 UPCs par requête), seulement si nécessaire
+        incomplete = [upc for upc in pending if _needs_openlibrary(google_batch[upc])]
+        openlibrary_batch = fetch_openlibrary_batch(incomplete) if incomplete else {}
+        
+        # 3. Fusion
+        futures = {executor.submit(enrich_one, upc): upc for upc in positions}
+        
+        for future in as_completed(futures):
+            upc = futures[future]
+            result = future.result()  # enrich_book intercepte ses erreurs
+            
+            for i in positions[upc]:
+                current += 1
+                
+                # Progress callback principal (appelé depuis ce thread uniquement)
+                if progress_callback:
+                    progress_callback(current, total, f"Livre {current}/{total}: {upc}")
+                # Log
+                print(f"\n[{current}/{total}] UPC: {upc}")
+                
+                # Stocker résultat (result contient déjà tous les champs + success)
+                data = result if i == positions[upc][0] else dict(result)
+                results[i] = {
+                    'upc': upc,
+                    'success': data.get('success', False),
+                    'message': 'Enrichi' if data.get('success') else 'Échec',
+                    'data': data  # Le dict complet avec tous les champs
+                }
+                
+                # Compter
+                if data.get('success'):
+                    success_count += 1
+                else:
+                    failed_count += 1
     
     print("\n" + "=" * 60)
     print(f"✅ Enrichissement terminé!")
@@ -448,23 +749,16 @@ def enrich_unenriched_scans(progress_callback=None):
     Args: progress_callback (callable)
     Returns: dict
     """
-    # Get unenriched scans
-    scans = database.get_unenriched_scans()
+    # UPCs uniques des scans non enrichis (dédoublonnés en SQL)
+    upc_list = database.get_unenriched_upcs()
     
-    if not scans:
+    if not upc_list:
         return {
             'success': 0,
             'failed': 0,
             'results': []
         }
     
-    # Extract unique UPCs
-    upc_set = set()
-    for scan in scans:
-        upc_set.add(scan['upc'])
-    
-    upc_list = list(upc_set)
-    
     # Enrich
     return enrich_books(upc_list, progress_callback)
 
@@ -472,6 +766,62 @@ def enrich_unenriched_scans(progress_callback=None):
 # DEBUG
 # ========================================================================
 
+def test_openlibrary_fallback():
+    """
+    Vérifie (sans réseau) qu'OpenLibrary est interrogé quand Google Books
+    n'a pas l'année de publication, pour un livre seul et en lot.
+    """
+    print("🧪 Test complément OpenLibrary (année manquante)...")
+    global fetch_google_books, fetch_openlibrary, fetch_openlibrary_batch
+    saved = (fetch_google_books, fetch_openlibrary, fetch_openlibrary_batch)
+    
+    upc = "9780000000001"
+    google = {'title': 'Titre', 'author': 'Auteur', 'publisher': 'Éditeur',
+              'pages': 100, 'description': 'Description', 'image_url': 'http://img',
+              'pub_year': None, 'language': 'eng'}
+    openlibrary = {'title': 'Titre', 'pub_year': '1999'}
+    queried = []
+    
+    def fake_openlibrary(u):
+        queried.append(u)
+        return openlibrary
+    
+    def fake_openlibrary_batch(upcs):
+        queried.extend(upcs)
+        return {u: openlibrary for u in upcs}
+    
+    try:
+        fetch_google_books = lambda u: dict(google)
+        fetch_openlibrary = fake_openlibrary
+        fetch_openlibrary_batch = fake_openlibrary_batch
+        
+        clear_enrich_cache()
+        result = enrich_book(upc)
+        assert queried == [upc], queried
+        assert result['publication_date'] == '1999', result
+        print("✅ enrich_book: année complétée par OpenLibrary")
+        
+        clear_enrich_cache()
+        queried.clear()
+        result = enrich_books([upc])['results'][0]['data']
+        assert queried == [upc], queried
+        assert result['publication_date'] == '1999', result
+        print("✅ enrich_books: UPC envoyé au lot OpenLibrary")
+        
+        # Google Books complet: aucun appel OpenLibrary
+        google['pub_year'] = '2001'
+        clear_enrich_cache()
+        queried.clear()
+        if not config.ENRICH_ALWAYS_MERGE_OL:
+            enrich_books([upc])
+            assert queried == [], queried
+            print("✅ Google Books complet: OpenLibrary non interrogé")
+    finally:
+        fetch_google_books, fetch_openlibrary, fetch_openlibrary_batch = saved
+        clear_enrich_cache()
+    
+    print("🎉 Test réussi!")
+
 if __name__ == "__main__":
     print("=" * 60)
     print("ENRICHMENT MODULE - TEST")
@@ -486,4 +836,7 @@ if __name__ == "__main__":
     print("\nNote: Ce test requiert que l'UPC existe dans la DB.")
     print("Pour test complet, utilise l'app principale.")
     
+    print()
+    test_openlibrary_fallback()
+    
     print("\n" + "=" * 60)
\ No newline at end of file
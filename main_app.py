@@ -15,6 +15,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
 import sys
 import csv
@@ -35,6 +36,53 @@ except ImportError as e:
     sys.exit(1)
 
 
+# Lectures SQLite des rafraîchissements: faites hors du thread Tk (une à la fois)
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ui-db')
+
+
+def run_in_background(widget, func, callback, poll_ms=20):
+    """
+    Exécute func() dans _DB_EXECUTOR puis callback(résultat) dans le
+    thread Tk (le widget vérifie la fin toutes les poll_ms millisecondes).
+    """
+    future = _DB_EXECUTOR.submit(func)
+    
+    def check():
+        if future.done():
+            callback(future.result())
+        else:
+            widget.after(poll_ms, check)
+    
+    widget.after(poll_ms, check)
+
+
+# Ligne eBay de preview (colonnes et ordre de config.EBAY_CSV_HEADERS) avec
+# les valeurs fixes en place: build_ebay_row_preview ne remplit que le reste
+_PREVIEW_FIXED_FIELDS = {
+    config.EBAY_CSV_HEADERS[0]: 'Add',          # *Action(SiteID=...|...)
+    'Quantity': 1,
+    'Format': config.EBAY_FORMAT,
+    'Duration': config.EBAY_DURATION,
+    'Location': config.EBAY_LOCATION,
+    'WeightMajor': 0,
+    'WeightMinor': 0,
+    'PackageLength': 0,
+    'PackageDepth': 0,
+    'PackageWidth': 0,
+    'PostalCode': config.EBAY_POSTAL_CODE,
+}
+_PREVIEW_ROW_TEMPLATE = [_PREVIEW_FIXED_FIELDS.get(header, '') for header in config.EBAY_CSV_HEADERS]
+
+# Position des colonnes variables de la preview
+_PREVIEW_COL = {header: i for i, header in enumerate(config.EBAY_CSV_HEADERS)}
+(_PV_SKU, _PV_TITLE, _PV_QUANTITY, _PV_CONDITION_ID, _PV_AUTHOR, _PV_BOOK_TITLE,
+ _PV_LANGUAGE, _PV_PUB_YEAR, _PV_WEIGHT_MAJOR, _PV_WEIGHT_MINOR, _PV_PKG_LENGTH,
+ _PV_PKG_DEPTH, _PV_PKG_WIDTH) = (_PREVIEW_COL[header] for header in (
+    'Custom label (SKU)', 'Title', 'Quantity', 'Condition ID', 'C:Author',
+    'C:Book Title', 'C:Language', 'C:Publication Year', 'WeightMajor',
+    'WeightMinor', 'PackageLength', 'PackageDepth', 'PackageWidth'))
+
+
 class ScannerLivreApp(tk.Tk):
     """Application principale Scanner Livre"""
     
@@ -305,7 +353,14 @@ class ScannerTab(ttk.Frame):
         self.current_condition = tk.StringVar(value="")
         self.last_scan_id = None
         
+        # Rafraîchissement de la liste (lecture DB en arrière-plan):
+        # seul le résultat de la dernière demande est affiché
+        self.scans_refresh_token = 0
+        self.scans_refresh_pending = False
+        self.scans_refresh_after = None
+        
         self.create_widgets()
+        self._build_dialogs()
         
     def create_widgets(self):
         """Crée les widgets de l'onglet Scanner"""
@@ -425,10 +480,10 @@ class ScannerTab(ttk.Frame):
         
         # Demander dimensions si nouveau UPC
         dimensions = database.get_dimensions_for_upc(upc)
+        new_dimensions = None
         if not dimensions:
             dimensions = self.ask_dimensions()
-            if dimensions:
-                database.save_dimensions_for_upc(upc, dimensions)
+            new_dimensions = dimensions
         
         # Créer le scan
         scan_data = {
@@ -450,8 +505,15 @@ class ScannerTab(ttk.Frame):
             scan_data['title'] = manifest_data.get('title', '')
             scan_data['msrp'] = manifest_data.get('msrp', 0)
         
-        # Insérer dans la DB
-        scan_id = database.insert_scan(scan_data)
+        # Insérer dans la DB (dimensions + scan: un seul commit)
+        with database.transaction():
+            if new_dimensions:
+                database.save_dimensions_for_upc(upc, new_dimensions)
+            scan_id = database.insert_scan(scan_data)
+        
+        if not scan_id:
+            messagebox.showerror("Erreur", f"Le scan de {upc} n'a pas pu être enregistré.")
+            return
         self.last_scan_id = scan_id
         
         # Mettre à jour l'affichage
@@ -462,50 +524,50 @@ class ScannerTab(ttk.Frame):
         # Clear entry
         self.scan_entry_var.set("")
         
-        # Refresh liste
-        self.refresh_scans()
+        # Ajoute la ligne en tête de liste (pas de relecture DB ni de rebuild)
+        self.add_recent_scan(scan_data)
         
         # Message de succès
         title = scan_data.get('title', 'Livre')
         self.app.update_status(f"✅ Scanné: {title} ({condition}) x{qty}")
         
-    def ask_quantity(self):
-        """Demande la quantité à l'utilisateur"""
+    def _build_dialogs(self):
+        """Construit une fois les dialogues Quantité / Dimensions (cachés)"""
+        # 'ok' / 'cancel' écrit à la fermeture d'un dialogue (voir _run_dialog)
+        self._dialog_result = tk.StringVar(value='')
+        
+        # --- Quantité ---
         dialog = tk.Toplevel(self)
+        dialog.withdraw()
         dialog.title("Quantité")
         dialog.geometry("300x150")
         dialog.transient(self)
-        dialog.grab_set()
-        
-        result = {'qty': None}
         
         ttk.Label(dialog, text="Quantité:", font=('Arial', 12)).pack(pady=10)
         
-        qty_var = tk.IntVar(value=1)
-        qty_spinbox = ttk.Spinbox(dialog, from_=1, to=100, textvariable=qty_var, width=10, font=('Arial', 14))
-        qty_spinbox.pack(pady=10)
-        qty_spinbox.focus()
+        self._qty_var = tk.IntVar(value=1)
+        self._qty_spinbox = ttk.Spinbox(dialog, from_=1, to=100, textvariable=self._qty_var, width=10, font=('Arial', 14))
+        self._qty_spinbox.pack(pady=10)
         
-        def confirm():
-            result['qty'] = qty_var.get()
-            dialog.destroy()
+        def confirm_qty():
+            try:
+                self._qty_var.get()
+            except tk.TclError:
+                return  # Saisie invalide: le dialogue reste ouvert
+            self._dialog_result.set('ok')
         
-        ttk.Button(dialog, text="OK", command=confirm).pack(pady=10)
+        ttk.Button(dialog, text="OK", command=confirm_qty).pack(pady=10)
         
-        qty_spinbox.bind('<Return>', lambda e: confirm())
+        self._qty_spinbox.bind('<Return>', lambda e: confirm_qty())
+        dialog.protocol('WM_DELETE_WINDOW', lambda: self._dialog_result.set('cancel'))
+        self._qty_dialog = dialog
         
-        dialog.wait_window()
-        return result['qty']
-    
-    def ask_dimensions(self):
-        """Demande les dimensions à l'utilisateur"""
+        # --- Dimensions ---
         dialog = tk.Toplevel(self)
+        dialog.withdraw()
         dialog.title("Dimensions du livre")
         dialog.geometry("400x300")
         dialog.transient(self)
-        dialog.grab_set()
-        
-        result = {'dims': None}
         
         ttk.Label(dialog, text="Entrez les dimensions:", font=('Arial', 12, 'bold')).pack(pady=10)
         
@@ -514,45 +576,81 @@ class ScannerTab(ttk.Frame):
         
         # Weight (oz)
         ttk.Label(frame, text="Poids (oz):").grid(row=0, column=0, sticky='e', padx=5, pady=5)
-        weight_var = tk.DoubleVar(value=16.0)
-        ttk.Entry(frame, textvariable=weight_var, width=10).grid(row=0, column=1, padx=5, pady=5)
+        self._weight_var = tk.DoubleVar(value=16.0)
+        self._weight_entry = ttk.Entry(frame, textvariable=self._weight_var, width=10)
+        self._weight_entry.grid(row=0, column=1, padx=5, pady=5)
         
         # Length (inches)
         ttk.Label(frame, text="Longueur (in):").grid(row=1, column=0, sticky='e', padx=5, pady=5)
-        length_var = tk.DoubleVar(value=9.0)
-        ttk.Entry(frame, textvariable=length_var, width=10).grid(row=1, column=1, padx=5, pady=5)
+        self._length_var = tk.DoubleVar(value=9.0)
+        ttk.Entry(frame, textvariable=self._length_var, width=10).grid(row=1, column=1, padx=5, pady=5)
         
         # Width (inches)
         ttk.Label(frame, text="Largeur (in):").grid(row=2, column=0, sticky='e', padx=5, pady=5)
-        width_var = tk.DoubleVar(value=6.0)
-        ttk.Entry(frame, textvariable=width_var, width=10).grid(row=2, column=1, padx=5, pady=5)
+        self._width_var = tk.DoubleVar(value=6.0)
+        ttk.Entry(frame, textvariable=self._width_var, width=10).grid(row=2, column=1, padx=5, pady=5)
         
         # Depth (inches)
         ttk.Label(frame, text="Épaisseur (in):").grid(row=3, column=0, sticky='e', padx=5, pady=5)
-        depth_var = tk.DoubleVar(value=1.0)
-        ttk.Entry(frame, textvariable=depth_var, width=10).grid(row=3, column=1, padx=5, pady=5)
-        
-        def confirm():
-            weight_oz = weight_var.get()
-            result['dims'] = {
-                'weight_major': int(weight_oz),
-                'weight_minor': int((weight_oz % 1) * 16),
-                'pkg_length': length_var.get(),
-                'pkg_width': width_var.get(),
-                'pkg_depth': depth_var.get()
-            }
-            dialog.destroy()
-        
-        def skip():
-            dialog.destroy()
+        self._depth_var = tk.DoubleVar(value=1.0)
+        ttk.Entry(frame, textvariable=self._depth_var, width=10).grid(row=3, column=1, padx=5, pady=5)
+        
+        def confirm_dims():
+            try:
+                for var in (self._weight_var, self._length_var, self._width_var, self._depth_var):
+                    var.get()
+            except tk.TclError:
+                return  # Saisie invalide: le dialogue reste ouvert
+            self._dialog_result.set('ok')
         
         button_frame = ttk.Frame(dialog)
         button_frame.pack(pady=10)
-        ttk.Button(button_frame, text="OK", command=confirm).pack(side='left', padx=5)
-        ttk.Button(button_frame, text="Ignorer", command=skip).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="OK", command=confirm_dims).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Ignorer", command=lambda: self._dialog_result.set('cancel')).pack(side='left', padx=5)
         
-        dialog.wait_window()
-        return result['dims']
+        dialog.protocol('WM_DELETE_WINDOW', lambda: self._dialog_result.set('cancel'))
+        self._dims_dialog = dialog
+    
+    def _run_dialog(self, dialog, focus_widget):
+        """Affiche un dialogue prébâti en modal, le recache à la fermeture.
+        Returns: True si OK, False si Ignorer / fermé"""
+        self._dialog_result.set('')
+        dialog.deiconify()
+        dialog.lift()
+        dialog.grab_set()
+        focus_widget.focus_set()
+        
+        self.wait_variable(self._dialog_result)
+        
+        dialog.grab_release()
+        dialog.withdraw()
+        return self._dialog_result.get() == 'ok'
+    
+    def ask_quantity(self):
+        """Demande la quantité à l'utilisateur"""
+        self._qty_var.set(1)
+        if not self._run_dialog(self._qty_dialog, self._qty_spinbox):
+            return None
+        return self._qty_var.get()
+    
+    def ask_dimensions(self):
+        """Demande les dimensions à l'utilisateur"""
+        self._weight_var.set(16.0)
+        self._length_var.set(9.0)
+        self._width_var.set(6.0)
+        self._depth_var.set(1.0)
+        
+        if not self._run_dialog(self._dims_dialog, self._weight_entry):
+            return None
+        
+        weight_oz = self._weight_var.get()
+        return {
+            'weight_major': int(weight_oz),
+            'weight_minor': int((weight_oz % 1) * 16),
+            'pkg_length': self._length_var.get(),
+            'pkg_width': self._width_var.get(),
+            'pkg_depth': self._depth_var.get()
+        }
     
     def undo_last_scan(self):
         """Annule le dernier scan"""
@@ -571,14 +669,55 @@ class ScannerTab(ttk.Frame):
         self.scan_entry_var.set("")
         self.scan_entry.focus()
     
+    def add_recent_scan(self, scan_data):
+        """Insère un nouveau scan en haut de la liste (max 20 lignes)"""
+        self.scans_tree.insert('', 0, values=(
+            datetime.now().isoformat(timespec='minutes'),  # même format que [:16]
+            scan_data.get('bin', ''),
+            scan_data.get('upc', ''),
+            (scan_data.get('title') or 'N/A')[:40],  # Titre tronqué
+            scan_data.get('condition', ''),
+            scan_data.get('quantity', 0)
+        ))
+        
+        children = self.scans_tree.get_children()
+        if len(children) > 20:
+            self.scans_tree.delete(*children[20:])
+        
+        # Une relecture en cours a pu partir avant ce scan: relire plus tard
+        if self.scans_refresh_pending:
+            self.schedule_refresh_scans()
+    
+    def schedule_refresh_scans(self, delay_ms=150):
+        """Relit la liste dans delay_ms (les demandes rapprochées n'en font qu'une)"""
+        if self.scans_refresh_after is not None:
+            self.after_cancel(self.scans_refresh_after)
+        self.scans_refresh_token += 1  # résultat d'une relecture en cours ignoré
+        self.scans_refresh_pending = True
+        self.scans_refresh_after = self.after(delay_ms, self.refresh_scans)
+    
     def refresh_scans(self):
-        """Rafraîchit la liste des derniers scans"""
-        # Vider le treeview
-        for item in self.scans_tree.get_children():
-            self.scans_tree.delete(item)
+        """Rafraîchit la liste des derniers scans (lecture DB en arrière-plan)"""
+        if self.scans_refresh_after is not None:
+            self.after_cancel(self.scans_refresh_after)
+            self.scans_refresh_after = None
+        
+        self.scans_refresh_token += 1
+        self.scans_refresh_pending = True
+        token = self.scans_refresh_token
+        run_in_background(self, lambda: database.get_recent_scans(20),
+                          lambda scans: self.show_recent_scans(scans, token))
+    
+    def show_recent_scans(self, scans, token):
+        """Remplace le contenu de la liste par `scans` (thread Tk)"""
+        if token != self.scans_refresh_token:
+            return  # Relecture dépassée par une demande plus récente
+        self.scans_refresh_pending = False
         
-        # Charger les derniers scans
-        scans = database.get_recent_scans(20)
+        # Vider le treeview (un seul appel Tcl pour toutes les lignes)
+        children = self.scans_tree.get_children()
+        if children:
+            self.scans_tree.delete(*children)
         
         for scan in scans:
             self.scans_tree.insert('', 'end', values=(
@@ -601,6 +740,12 @@ class EnrichmentTab(ttk.Frame):
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        self.preview_scans = []   # scans à afficher dans la preview
+        self.preview_loaded = 0   # combien sont déjà insérés dans le treeview
+        # Logs regroupés (l'enrichissement logue depuis son thread)
+        self.log_buffer = []
+        self.log_lock = threading.Lock()
+        self.log_flush_scheduled = False
         self.create_widgets()
         
     def create_widgets(self):
@@ -678,7 +823,9 @@ class EnrichmentTab(ttk.Frame):
         scrollbar_x = ttk.Scrollbar(preview_frame, orient='horizontal', command=self.preview_tree.xview)
         scrollbar_x.pack(side='bottom', fill='x')
 
-        self.preview_tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        # Défilement vertical: complète aussi la preview quand on approche du bas
+        self.preview_scrollbar_y = scrollbar_y
+        self.preview_tree.configure(yscrollcommand=self.on_preview_scroll, xscrollcommand=scrollbar_x.set)
 
         # Boutons
         button_frame = ttk.Frame(main_frame)
@@ -706,92 +853,73 @@ class EnrichmentTab(ttk.Frame):
     
     def refresh_preview(self):
         """Rafraîchit la preview des scans à enrichir (format eBay 51 colonnes)"""
-        # Vider le treeview
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
+        # Scans non enrichis + compteur lus en arrière-plan, affichés ensuite
+        run_in_background(
+            self,
+            lambda: (database.get_unenriched_scans(), database.get_enriched_count()),
+            self.show_preview
+        )
+    
+    def show_preview(self, data):
+        """Affiche la preview à partir de (scans, enriched) (thread Tk)"""
+        scans, enriched = data
         
-        # Charger les scans non enrichis
-        scans = database.get_unenriched_scans()
+        # Vider le treeview (un seul appel Tcl pour toutes les lignes)
+        children = self.preview_tree.get_children()
+        if children:
+            self.preview_tree.delete(*children)
         
         # Mettre à jour les stats
         total = len(scans)
-        enriched = database.get_enriched_count()
         self.stats_label.config(text=f"Scans enrichis: {enriched} | À enrichir: {total}")
         
-        # Remplir le treeview avec format eBay
-        for scan in scans[:100]:  # Limiter à 100 pour ne pas surcharger
-            ebay_row = self.build_ebay_row_preview(scan)
-            self.preview_tree.insert('', 'end', values=ebay_row)
+        # Remplir le treeview avec format eBay: un premier écran seulement,
+        # la suite est ajoutée au défilement (on_preview_scroll)
+        self.preview_scans = scans[:100]  # Limiter à 100 pour ne pas surcharger
+        self.preview_loaded = 0
+        self.load_more_preview()
         
         if total > 100:
             self.log(f"Affichage des 100 premiers sur {total} scans à enrichir")
     
+    def load_more_preview(self, count=30):
+        """Ajoute les `count` lignes suivantes de la preview"""
+        start = self.preview_loaded
+        batch = self.preview_scans[start:start + count]
+        for scan in batch:
+            self.preview_tree.insert('', 'end', values=self.build_ebay_row_preview(scan))
+        self.preview_loaded = start + len(batch)
+    
+    def on_preview_scroll(self, first, last):
+        """yscrollcommand de la preview: met à jour la scrollbar, charge la suite près du bas"""
+        self.preview_scrollbar_y.set(first, last)
+        if float(last) >= 0.9 and self.preview_loaded < len(self.preview_scans):
+            # after_idle: ne pas insérer pendant le calcul de la vue
+            self.after_idle(self.load_more_preview)
+    
     def build_ebay_row_preview(self, scan):
         """Construit une ligne au format eBay (51 colonnes) pour preview"""
-        # Récupérer la quantité (plusieurs clés possibles)
-        qty = scan.get('quantity') or scan.get('qty') or 1
-        return (
-            'Add',                                      # Action
-            scan.get('upc', ''),                        # Custom label (SKU) = UPC
-            '',                                         # Category ID
-            '',                                         # Category name
-            scan.get('title', 'N/A')[:100],            # Title
-            '',                                         # Relationship
-            '',                                         # Relationship details
-            '',                                         # Schedule Time
-            '',                                         # P:EPID
-            '',                                         # Start price (sera calculé)
-            qty,                                        # Quantity (corrigé)
-            '',                                         # Item photo URL
-            '',                                         # VideoID
-            self.get_condition_id(scan.get('condition', 'USED')),  # Condition ID
-            '',                                         # Description (sera enrichi)
-            'FixedPrice',                              # Format
-            'GTC',                                     # Duration
-            '',                                         # Buy It Now price
-            '',                                         # Best Offer Enabled
-            '',                                         # Best Offer Auto Accept Price
-            '',                                         # Minimum Best Offer Price
-            '',                                         # Immediate pay required
-            'VALCOURT,QC',                             # Location (FIXE)
-            '',                                         # Shipping service 1 option
-            '',                                         # Shipping service 1 cost
-            '',                                         # Shipping service 1 priority
-            '',                                         # Shipping service 2 option
-            '',                                         # Shipping service 2 cost
-            '',                                         # Shipping service 2 priority
-            '',                                         # Max dispatch time
-            '',                                         # Returns accepted option
-            '',                                         # Returns within option
-            '',                                         # Refund option
-            '',                                         # Return shipping cost paid by
-            '',                                         # Shipping profile name
-            '',                                         # Return profile name
-            '',                                         # Payment profile name
-            '',                                         # ProductCompliancePolicyID
-            '',                                         # Regional ProductCompliancePolicies
-            scan.get('author', ''),                     # C:Author (sera enrichi)
-            scan.get('title', '')[:100],               # C:Book Title
-            scan.get('language', ''),                   # C:Language (sera enrichi)
-            '',                                         # C:Format (sera enrichi)
-            scan.get('pub_year', ''),                   # C:Publication Year (sera enrichi)
-            scan.get('weight_major', 0),               # WeightMajor
-            scan.get('weight_minor', 0),               # WeightMinor
-            '',                                         # WeightUnit
-            scan.get('pkg_length', 0),                 # PackageLength
-            scan.get('pkg_depth', 0),                  # PackageDepth
-            scan.get('pkg_width', 0),                  # PackageWidth
-            'J0E2L0'                                   # PostalCode (FIXE)
-        )
+        row = _PREVIEW_ROW_TEMPLATE.copy()
+        
+        row[_PV_SKU] = scan.get('upc', '')                                      # SKU = UPC
+        row[_PV_TITLE] = scan.get('title', 'N/A')[:100]
+        row[_PV_QUANTITY] = scan.get('quantity') or scan.get('qty') or 1        # plusieurs clés possibles
+        row[_PV_CONDITION_ID] = self.get_condition_id(scan.get('condition', 'USED'))
+        row[_PV_AUTHOR] = scan.get('author', '')
+        row[_PV_BOOK_TITLE] = scan.get('title', '')[:100]
+        row[_PV_LANGUAGE] = scan.get('language', '')
+        row[_PV_PUB_YEAR] = scan.get('pub_year', '')
+        row[_PV_WEIGHT_MAJOR] = scan.get('weight_major', 0)
+        row[_PV_WEIGHT_MINOR] = scan.get('weight_minor', 0)
+        row[_PV_PKG_LENGTH] = scan.get('pkg_length', 0)
+        row[_PV_PKG_DEPTH] = scan.get('pkg_depth', 0)
+        row[_PV_PKG_WIDTH] = scan.get('pkg_width', 0)
+        return tuple(row)
     
     def get_condition_id(self, condition):
         """Retourne l'ID de condition eBay"""
-        condition_map = {
-            'NEW': '1000',
-            'GOOD': '2750',
-            'USED': '5000'
-        }
-        return condition_map.get(condition.upper(), '5000')
+        # DONATION ('' dans config) et inconnues: USED
+        return config.CONDITION_ID.get(condition.upper() if condition else '') or '5000'
     
     def start_enrichment(self):
         """Lance l'enrichissement en arrière-plan"""
@@ -810,39 +938,37 @@ class EnrichmentTab(ttk.Frame):
             result = enrichment_module.enrich_unenriched_scans(progress_callback=self.log_progress)
             success_count = 0
             fail_count = 0
+            # UPC → IDs de ses scans non enrichis: une seule requête,
+            # au lieu d'une requête complète par résultat
+            scan_ids_by_upc = {}
+            try:
+                scan_ids_by_upc = database.get_unenriched_scan_ids()
+            except Exception as e:
+                self.log(f"[DEBUG] Erreur lecture scans non enrichis: {e}")
+            # Mises à jour collectées puis écrites en une seule transaction
+            pending = []
             for idx, res in enumerate(result.get('results', []), 1):
                 upc = res.get('upc')
                 success = res.get('success', False)
                 data = res.get('data', {})
                 msg = res.get('message', '')
                 self.log(f"[DEBUG] Résultat {idx}: UPC={upc} | Succès={success} | Message={msg}")
-                # Chercher le scan_id correspondant à l'UPC
-                scan = None
-                try:
-                    scans = database.get_unenriched_scans()
-                    scan = next((s for s in scans if s.get('upc') == upc), None)
-                except Exception as e:
-                    self.log(f"[DEBUG] Erreur recherche scan pour UPC {upc}: {e}")
-                if scan and success:
-                    scan_id = scan.get('id')
-                    if scan_id is not None:
-                        try:
-                            ok = database.update_scan_enrichment(scan_id, data)
-                            if ok:
-                                self.log(f"[DEBUG] update_scan_enrichment OK pour scan_id={scan_id}")
-                                success_count += 1
-                            else:
-                                self.log(f"[DEBUG] update_scan_enrichment ECHEC pour scan_id={scan_id}")
-                                fail_count += 1
-                        except Exception as e:
-                            self.log(f"[DEBUG] Exception update_scan_enrichment: {e}")
-                            fail_count += 1
-                    else:
-                        self.log(f"[DEBUG] scan_id introuvable pour UPC {upc}")
-                        fail_count += 1
+                # Chercher les scans correspondant à l'UPC (un par condition)
+                scan_ids = scan_ids_by_upc.get(upc, [])
+                if scan_ids and success:
+                    pending.extend((scan_id, data) for scan_id in scan_ids)
                 else:
                     self.log(f"[DEBUG] Scan non trouvé ou enrichissement échoué pour UPC {upc}")
-                    fail_count += 1
+                    fail_count += len(scan_ids) or 1
+            if pending:
+                updated = set(database.update_scans_enrichment_many(pending))
+                for scan_id, _ in pending:
+                    if scan_id in updated:
+                        self.log(f"[DEBUG] update_scan_enrichment OK pour scan_id={scan_id}")
+                        success_count += 1
+                    else:
+                        self.log(f"[DEBUG] update_scan_enrichment ECHEC pour scan_id={scan_id}")
+                        fail_count += 1
             self.log(f"✅ Terminé! Succès: {success_count}, Échecs: {fail_count}")
             messagebox.showinfo("Enrichissement terminé", f"Succès: {success_count}\nÉchecs: {fail_count}")
         except Exception as e:
@@ -861,16 +987,38 @@ class EnrichmentTab(ttk.Frame):
             log_msg = f"[{timestamp}] [{current}/{total}] {message}\n"
         else:
             log_msg = f"[{timestamp}] Progression: {current}/{total}\n"
-        self.log_text.insert('end', log_msg)
-        self.log_text.see('end')
-        self.log_text.update_idletasks()
+        self.queue_log(log_msg)
 
     def log(self, message):
         """Log a simple message without progress counter."""
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert('end', f"[{timestamp}] {message}\n")
+        self.queue_log(f"[{timestamp}] {message}\n")
+    
+    def queue_log(self, line):
+        """Met une ligne en attente; affichée par lot toutes les 200 ms"""
+        with self.log_lock:
+            self.log_buffer.append(line)
+            if self.log_flush_scheduled:
+                return
+            self.log_flush_scheduled = True
+        self.after(200, self.flush_log)
+    
+    def flush_log(self):
+        """Écrit les lignes en attente d'un coup, garde les 2000 dernières"""
+        with self.log_lock:
+            lines = self.log_buffer
+            self.log_buffer = []
+            self.log_flush_scheduled = False
+        if not lines:
+            return
+        
+        self.log_text.insert('end', ''.join(lines))
+        
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if line_count > 2000:
+            self.log_text.delete("1.0", f"{line_count - 2000 + 1}.0")
+        
         self.log_text.see('end')
-        self.log_text.update_idletasks()
 
 
 # ============================================================================
@@ -1244,9 +1392,10 @@ class ManifestTab(ttk.Frame):
         # LOG dans la console
         print(f"🔍 Recherche MANIFEST: '{search_term}'")
 
-        # Vider le treeview
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
+        # Vider le treeview (un seul appel Tcl pour toutes les lignes)
+        children = self.results_tree.get_children()
+        if children:
+            self.results_tree.delete(*children)
 
         # Rechercher
         results = database.search_manifest(search_term)
@@ -1359,9 +1508,10 @@ class DatabaseTab(ttk.Frame):
 
     def load_all_scans(self):
         """Charge tous les scans dans le tableau"""
-        # Vider le treeview
-        for item in self.scans_tree.get_children():
-            self.scans_tree.delete(item)
+        # Vider le treeview (un seul appel Tcl pour toutes les lignes)
+        children = self.scans_tree.get_children()
+        if children:
+            self.scans_tree.delete(*children)
 
         query = "SELECT * FROM scans ORDER BY timestamp DESC"
         scans = database.fetch_all(query)
@@ -1369,6 +1519,11 @@ class DatabaseTab(ttk.Frame):
         total_qty = 0
         total_vendue = 0
 
+        # MANIFEST de tous les UPCs affichés en une requête groupée
+        manifest_by_upc = database.get_manifest_data_bulk(
+            [scan.get('upc', '') for scan in scans]
+        )
+
         for scan in scans:
             qty = scan.get('quantity', 0)
             qty_vendue = scan.get('qty_vendue', 0)
@@ -1379,7 +1534,7 @@ class DatabaseTab(ttk.Frame):
             upc = scan.get('upc', '')
 
             # Quantité dans le MANIFEST
-            manifest_data = database.get_manifest_data(upc)
+            manifest_data = manifest_by_upc.get(upc)
             if manifest_data and manifest_data.get('quantity'):
                 qty_manifest = manifest_data.get('quantity', 0)
             else:
@@ -1615,4 +1770,7 @@ class DashboardTab(ttk.Frame):
 
 if __name__ == "__main__":
     app = ScannerLivreApp()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
+    
+    # Entretien à la fermeture (pages libres, stats du planificateur, WAL)
+    database.maintenance()
\ No newline at end of file
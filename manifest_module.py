@@ -11,6 +11,7 @@ import csv
 import os
 import re
 import database
+import config
 
 
 def clean_price(price_str):
@@ -119,6 +120,7 @@ def import_from_csv(filepath):
     errors = 0
     skipped = 0
     total_lines = 0
+    items = []
     
     try:
         with open(filepath, 'r', encoding='utf-8-sig', errors='replace') as f:
@@ -150,7 +152,7 @@ def import_from_csv(filepath):
                     msrp = clean_price(row.get('MSRP', '0'))
                     
                     # Validation UPC (10-14 chiffres)
-                    if not upc or len(upc) < 10 or len(upc) > 14:
+                    if not config.is_valid_upc(upc):
                         skipped += 1
                         if total_lines <= 5:  # Log seulement les 5 premiers
                             print(f"   ⚠️ Ligne {total_lines}: UPC invalide '{upc}' (longueur: {len(upc)})")
@@ -174,19 +176,25 @@ def import_from_csv(filepath):
                         'msrp': msrp
                     }
                     
-                    # Insert dans DB
-                    database.insert_manifest_item(item)
-                    count += 1
+                    # Accumule pour l'insert groupé
+                    items.append(item)
                     
                     # Log progression tous les 1000
-                    if count % 1000 == 0:
-                        print(f"   📊 Importé: {count} livres...")
+                    if len(items) % 1000 == 0:
+                        print(f"   📊 Lu: {len(items)} livres...")
                     
                 except Exception as e:
                     errors += 1
                     if errors <= 5:  # Log seulement les 5 premières erreurs
                         print(f"   ❌ Ligne {total_lines}: {e}")
         
+        # Insert dans DB: une seule transaction pour tout le fichier
+        if items:
+            if database.insert_manifest_items_bulk(items):
+                count = len(items)
+            else:
+                errors += len(items)
+        
         # Résumé final
         print("=" * 60)
         print(f"   Total lignes: {total_lines}")
@@ -243,6 +251,7 @@ def import_from_excel(filepath):
         count = 0
         errors = 0
         skipped = 0
+        items = []
         
         print(f"📥 Import EXCEL...")
         
@@ -295,7 +304,7 @@ def import_from_excel(filepath):
                 msrp = clean_price(row[col_map.get('msrp', 6)] or '0')
                 
                 # Validation
-                if not upc or len(upc) < 10 or len(upc) > 14:
+                if not config.is_valid_upc(upc):
                     skipped += 1
                     continue
                 
@@ -313,11 +322,10 @@ def import_from_excel(filepath):
                     'msrp': msrp
                 }
                 
-                database.insert_manifest_item(item)
-                count += 1
+                items.append(item)
                 
-                if count % 1000 == 0:
-                    print(f"   📊 Importé: {count} livres...")
+                if len(items) % 1000 == 0:
+                    print(f"   📊 Lu: {len(items)} livres...")
                 
             except Exception as e:
                 errors += 1
@@ -326,6 +334,13 @@ def import_from_excel(filepath):
         
         workbook.close()
         
+        # Insert dans DB: une seule transaction pour tout le fichier
+        if items:
+            if database.insert_manifest_items_bulk(items):
+                count = len(items)
+            else:
+                errors += len(items)
+        
         print("=" * 60)
         print(f"   ✅ Importé: {count}")
         print(f"   ⚠️ Ignoré: {skipped}")
@@ -145,10 +145,12 @@ def check_and_update_sold_out(upc):
     Vérifie si un UPC est sold out et met à jour status.
     Args: upc (str)
     """
-    # Get total scanned
-    scans = database.get_scans_by_upc(upc)
-    total_scanned = sum(scan['quantity'] for scan in scans)
-    total_vendue = sum(scan['qty_vendue'] for scan in scans)
+    # Get total scanned (une passe sur les lignes, sans liste intermédiaire)
+    total_scanned = 0
+    total_vendue = 0
+    for scan in database.iter_scans_by_upc(upc):
+        total_scanned += scan['quantity']
+        total_vendue += scan['qty_vendue']
     
     # If sold out
     if total_vendue >= total_scanned:
@@ -159,9 +161,8 @@ def update_all_status():
     Met à jour tous les status basé sur qty vendue.
     """
     query = "SELECT DISTINCT upc FROM scans"
-    upcs = database.fetch_all(query)
     
-    for item in upcs:
+    for item in database.iter_rows(query):
         check_and_update_sold_out(item['upc'])
 
 # ========================================================================
@@ -173,12 +174,12 @@ def get_sales_summary():
     Résumé des ventes.
     Returns: dict
     """
-    # Total sales
-    all_sales = database.get_all_sales()
+    # Total sales (agrégats SQL, pas de chargement de toute la table)
+    totals = database.get_sales_totals()
     
-    total_orders = len(all_sales)
-    total_items = sum(sale['quantity'] for sale in all_sales)
-    total_revenue = database.get_total_revenue()
+    total_orders = totals['total_orders']
+    total_items = totals['total_items']
+    total_revenue = totals['total_revenue']
     
     # Average
     avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
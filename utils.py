@@ -7,6 +7,22 @@ import re
 from datetime import datetime
 import config
 
+# Expressions compilées une fois (appelées pour chaque livre enrichi/exporté)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+_FILENAME_INVALID_RE = re.compile(r'[^\w\-_\.]')
+_UNDERSCORES_RE = re.compile(r'_+')
+
+# Codes langue ISO → libellé affiché dans la description eBay
+_LANG_DISPLAY = {
+    'eng': 'Anglais',
+    'fra': 'Français',
+    'fre': 'Français',
+    'spa': 'Espagnol',
+    'deu': 'Allemand',
+    'ger': 'Allemand'
+}
+
 # ========================================================================
 # VALIDATION
 # ========================================================================
@@ -19,7 +35,7 @@ def validate_bin(bin_code):
     if not bin_code:
         return False
     
-    return re.match(config.BIN_REGEX, bin_code.upper()) is not None
+    return config.is_valid_bin(bin_code.upper())
 
 def validate_upc(upc):
     """
@@ -29,13 +45,8 @@ def validate_upc(upc):
     if not upc:
         return False
     
-    # Doit être que des chiffres
-    if not upc.isdigit():
-        return False
-    
-    # Longueur 10-14
-    length = len(upc)
-    return config.UPC_MIN_LENGTH <= length <= config.UPC_MAX_LENGTH
+    # 10-14 chiffres uniquement
+    return config.is_valid_upc(upc)
 
 def validate_condition(condition):
     """
@@ -194,10 +205,10 @@ def clean_text(text):
     text = text.strip()
     
     # Enlève tags HTML simples
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _HTML_TAG_RE.sub('', text)
     
     # Enlève espaces multiples
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     
     return text
 
@@ -219,10 +230,10 @@ def sanitize_filename(filename):
     Returns: str
     """
     # Garde seulement: lettres, chiffres, -, _, .
-    filename = re.sub(r'[^\w\-_\.]', '_', filename)
+    filename = _FILENAME_INVALID_RE.sub('_', filename)
     
     # Enlève underscores multiples
-    filename = re.sub(r'_+', '_', filename)
+    filename = _UNDERSCORES_RE.sub('_', filename)
     
     return filename
 
@@ -239,7 +250,8 @@ def calculate_price(msrp, condition):
     if not msrp or msrp <= 0:
         return config.MIN_PRICE
     
-    factor = config.get_price_factor(condition.upper())
+    # get_price_factor gère déjà la casse (table directe, puis .upper())
+    factor = config.get_price_factor(condition)
     
     price = msrp * factor
     
@@ -384,18 +396,10 @@ def generate_ebay_description(book_data):
     condition = book_data.get('condition', 'USED')
     
     # Map language code
-    lang_map = {
-        'eng': 'Anglais',
-        'fra': 'Français',
-        'fre': 'Français',
-        'spa': 'Espagnol',
-        'deu': 'Allemand',
-        'ger': 'Allemand'
-    }
-    lang_display = lang_map.get(language.lower(), language)
+    lang_display = _LANG_DISPLAY.get(language.lower(), language)
     
     # Condition description
-    condition_desc = config.CONDITIONS.get(condition.upper(), {}).get('description', '')
+    condition_desc = config.CONDITION_DESCRIPTION.get(condition.upper(), '')
     
     html = f"""
 <div style="font-family: Arial, sans-serif; max-width: 700px; margin: 0 auto; padding: 20px; background: #ffffff;">